@@ -10,8 +10,34 @@ dotenv.load_dotenv()
 CASSANDRA_HOST = os.getenv("CASSANDRA_HOST")
 KEYSPACE_NAME = os.getenv("KEYSPACE_NAME")
 REPLICATION_FACTOR = int(os.getenv("REPLICATION_FACTOR", 1))
+BULK_LOAD_WORKERS = int(os.getenv("BULK_LOAD_WORKERS", os.cpu_count() or 1))
+EXECUTION_PROFILE = {
+    "load_balancing": os.getenv("CASSANDRA_LOAD_BALANCING"),
+    "local_dc": os.getenv("CASSANDRA_LOCAL_DC"),
+    "used_hosts_per_remote_dc": os.getenv("CASSANDRA_USED_HOSTS_PER_REMOTE_DC"),
+    "core_connections_per_host": os.getenv("CASSANDRA_CORE_CONNECTIONS_PER_HOST"),
+    "max_connections_per_host": os.getenv("CASSANDRA_MAX_CONNECTIONS_PER_HOST"),
+    "compression": os.getenv("CASSANDRA_COMPRESSION"),
+    "request_timeout": os.getenv("CASSANDRA_REQUEST_TIMEOUT"),
+    "speculative_delay": os.getenv("CASSANDRA_SPECULATIVE_DELAY"),
+    "speculative_max_attempts": os.getenv("CASSANDRA_SPECULATIVE_MAX_ATTEMPTS"),
+    "protocol_version": os.getenv("CASSANDRA_PROTOCOL_VERSION"),
+}
+CONSISTENCY_POLICY = {
+    operation: os.getenv(f"CONSISTENCY_{operation.upper()}")
+    for operation in (
+        "listing",
+        "count",
+        "lookup",
+        "existence_check",
+        "conflict_check",
+        "write",
+        "serial",
+    )
+}
 
-MOCK_DATA_DIR = Path(__file__).parent / "mockdata_s"
+MOCK_DATA_DIR = Path(os.getenv("MOCK_DATA_DIR", Path(__file__).parent / "mockdata_s"))
+SNAPSHOT_DIR = Path(os.getenv("SNAPSHOT_DIR", Path(__file__).parent / "snapshot"))
 
 if __name__ == "__main__":
     rent_app = app.RentalApp(
@@ -19,7 +45,11 @@ if __name__ == "__main__":
             "hosts": [CASSANDRA_HOST],
             "keyspace": KEYSPACE_NAME,
             "replication_factor": REPLICATION_FACTOR,
-        }
+            "execution_profile": EXECUTION_PROFILE,
+            "consistency_policy": CONSISTENCY_POLICY,
+        },
+        bulk_load_workers=BULK_LOAD_WORKERS,
     )
     rent_app.set_mock_data_dir(MOCK_DATA_DIR)
+    rent_app.set_snapshot_dir(SNAPSHOT_DIR)
     rent_app.run()
@@ -1,3 +1,5 @@
+import uuid
+
 import customtkinter as ctk
 
 from pathlib import Path
@@ -7,25 +9,48 @@ from typing import Callable
 from tkinter import messagebox
 from cassandra.cluster import NoHostAvailable
 
-from . import util, stress, exceptions
+from . import bulk, util, stress, exceptions
 from .cassio import CassandraHandler
 from .ui import UI, LoadingBox
-from .data import models, mock, requests
+from .data import (
+    consistency,
+    counters,
+    migrations,
+    models,
+    mock,
+    name_index,
+    name_lookup,
+    occupancy,
+    paging,
+    requests,
+    scan,
+)
 from .task import LongRunningTask
+from .worker import UIWorker
+from .channel import UpdateChannel
 from .timer import Timer
 
 
 class RentalApp:
-    def __init__(self, cassandra_spec: dict):
+    def __init__(self, cassandra_spec: dict, bulk_load_workers: int = 1):
         self.root = ctk.CTk()
         self.root.title("Rental App")
-        self.sync_table = {}
         self.cass_spec = cassandra_spec
+        self.bulk_load_workers = bulk_load_workers
+        self.name_indexes = {
+            "user": name_index.NameIndex(models.User),
+            "property": name_index.NameIndex(models.RentalProperty),
+        }
 
         self.ui = UI(self.root, model_names=[model.__name__ for model in models.MODELS])
+        self.updates = UpdateChannel(
+            self.root, lambda tag, text: self.ui.set_label_text(tag, str(text))
+        )
         self.mock_data_dir = None
+        self.snapshot_dir = None
         self.cassandra_handler = CassandraHandler(**cassandra_spec)
 
+        self.worker = UIWorker(self.root)
         self.setup_button_callbacks()
 
         self.loading_box = LoadingBox()
@@ -33,41 +58,76 @@ class RentalApp:
         self.loading_box.mainloop()
         self.loading_box.destroy()
 
-        def scheduled_table_sync():
-            self.update_labels_from_sync_table()
-            self.root.after(200, scheduled_table_sync)
-
         self.reload_model_counts()
-        scheduled_table_sync()
+        self.updates.start()
+        self.worker.start()
 
     def reload_model_counts(self):
+        for model_name, count in counters.read_counts(models.MODELS).items():
+            tag = f"{util.name_to_tag(model_name)}_count"
+            self.updates.publish(tag, str(count))
+
+    def on_recount_models(self):
         for model in models.MODELS:
-            tag = f"{util.name_to_tag(model.__name__)}_count"
-            self.sync_table[tag] = str(model.objects.count())
+            counters.set_count(model, scan.count(model))
+
+    def on_rebuild_side_tables(self):
+        migrations.rebuild_side_tables()
+        self.invalidate_indexes()
 
     def on_clear_database(self):
-        self.cassandra_handler.clear_tables(models.MODELS, safe=False)
+        self.cassandra_handler.clear_tables(models.ALL_MODELS, safe=False)
+        self.invalidate_indexes()
 
     def on_repopulate_database(self):
         if self.mock_data_dir is None:
             raise ValueError("Mock data directory not set")
         if not self.mock_data_dir.exists():
             raise ValueError("Mock data directory does not exist")
-        self.cassandra_handler.clear_tables(models.MODELS, safe=False)
-        mock.load_mock_data(self.mock_data_dir)
+        self.cassandra_handler.clear_tables(models.ALL_MODELS, safe=False)
+        self.invalidate_indexes()
+        if self.bulk_load_workers <= 1:
+            mock.load_mock_data(self.mock_data_dir)
+            return
+        bulk.load_mock_data_sharded(
+            self.mock_data_dir,
+            self.cass_spec,
+            workers=self.bulk_load_workers,
+            progress_callback=self.on_bulk_load_progress,
+        )
+
+    def on_save_snapshot(self):
+        if self.snapshot_dir is None:
+            raise ValueError("Snapshot directory not set")
+        self.cassandra_handler.export_snapshot(self.snapshot_dir, models.ALL_MODELS)
+
+    def on_restore_snapshot(self):
+        if self.snapshot_dir is None:
+            raise ValueError("Snapshot directory not set")
+        self.cassandra_handler.import_snapshot(self.snapshot_dir, models.ALL_MODELS)
+        self.invalidate_indexes()
+
+    def on_bulk_load_progress(self, progress: bulk.BulkLoadProgress):
+        self.updates.publish(
+            "status_value",
+            f"Loading {progress.model_name}: {progress.model_rows} rows "
+            f"({progress.rows_per_second:.0f} rows/s)",
+        )
+
+    def invalidate_indexes(self):
+        for index in self.name_indexes.values():
+            index.invalidate()
+        models.availability_index.invalidate()
+        models.occupancy_index.invalidate()
 
     def on_refresh_inputs(self):
-        all_user_names = models.User.objects.all().values_list("name")
-        flat_all_user_names = [name for sublist in all_user_names for name in sublist]
-        all_car_names = models.RentalProperty.objects.all().values_list("name")
-        flat_all_car_names = [name for sublist in all_car_names for name in sublist]
-        for prefix in ["mr", "c", "u", "v"]:
-            self.ui.component_registry.get_combo_box(
-                f"{prefix}_user_combo_box"
-            ).configure(values=flat_all_user_names)
-            self.ui.component_registry.get_combo_box(
-                f"{prefix}_property_combo_box"
-            ).configure(values=flat_all_car_names)
+        for kind, index in self.name_indexes.items():
+            index.refresh()
+            for prefix in ["mr", "c", "u", "v"]:
+                combo_box = self.ui.component_registry.get_combo_box(
+                    f"{prefix}_{kind}_combo_box"
+                )
+                combo_box.configure(values=index.search(combo_box.get()))
 
     def _get_user_property_from_combo_box(self, box_prefix: str) -> tuple[str, str]:
         user_name = self.ui.component_registry.get_combo_box(
@@ -78,6 +138,38 @@ class RentalApp:
         ).get()
         return user_name, property_name
 
+    def _show_handler_error(self, error: Exception) -> None:
+        if isinstance(
+            error, (models.User.DoesNotExist, models.RentalProperty.DoesNotExist)
+        ):
+            messagebox.showerror("Error", "Bad user/property name")
+        elif isinstance(error, exceptions.BookingNotFoundException):
+            messagebox.showerror("Error", "No booking found for user/property")
+        elif isinstance(error, exceptions.RentalException):
+            messagebox.showerror("Error", f"Reservation failed with error: {error}")
+        else:
+            messagebox.showerror("Error", f"Request failed with error: {error}")
+
+    def _run_handler(
+        self, key: str, work: Callable, on_done: Callable = lambda _: None
+    ) -> None:
+        self.worker.submit(key, work, on_done, self._show_handler_error)
+
+    def _find_booking(self, user_name: str, property_name: str) -> models.RentalBooking:
+        user_id = name_lookup.get_id(models.User, user_name)
+        property_id = name_lookup.get_id(models.RentalProperty, property_name)
+        booking = (
+            consistency.objects(models.RentalBooking, consistency.Operation.LOOKUP)
+            .filter(user_id=user_id, rental_id=property_id)
+            .allow_filtering()
+            .first()
+        )
+        if booking is None:
+            raise exceptions.BookingNotFoundException(
+                f"No booking of {property_name} by {user_name}"
+            )
+        return booking
+
     def on_make_reservation(self):
         user_name, property_name = self._get_user_property_from_combo_box("mr")
         start_date = self.ui.component_registry.get_entry("mr_start_date_entry").get()
@@ -88,50 +180,38 @@ class RentalApp:
         if start_date == "" or end_date == "":
             messagebox.showerror("Error", "Please enter a start and end date")
             return
-        try:
-            user = models.User.objects.filter(name=user_name).first()
-            property = models.RentalProperty.objects.filter(name=property_name).first()
+
+        def make_reservation():
             requests.make_reservation(
-                user_id=user.id,
-                property_id=property.id,
+                user_id=name_lookup.get_id(models.User, user_name),
+                property_id=name_lookup.get_id(models.RentalProperty, property_name),
                 start_date=start_date,
                 end_date=end_date,
                 ignore_errors=False,
             )
-        except models.User.DoesNotExist:
-            messagebox.showerror("Error", "Bad user/property name")
-            return
-        except exceptions.RentalException as e:
-            messagebox.showerror("Error", f"Reservation failed with error: {e}")
-            return
-        messagebox.showinfo("Success", "Reservation made successfully")
+
+        self._run_handler(
+            "make_reservation",
+            make_reservation,
+            lambda _: messagebox.showinfo("Success", "Reservation made successfully"),
+        )
 
     def on_cancel_reservation(self):
         user_name, property_name = self._get_user_property_from_combo_box("c")
         if user_name == "" or property_name == "":
             messagebox.showerror("Error", "Please select a user and a property")
             return
-        try:
-            user = models.User.objects.filter(name=user_name).first()
-            property = models.RentalProperty.objects.filter(name=property_name).first()
-            booking = (
-                models.RentalBooking.objects.filter(
-                    user_id=user.id, rental_id=property.id
-                )
-                .allow_filtering()
-                .first()
-            )
-            if booking is None:
-                messagebox.showerror("Error", "No booking found for user/property")
-                return
-            requests.cancel_booking(booking.id)
-        except models.User.DoesNotExist:
-            messagebox.showerror("Error", "Bad user/property name")
-            return
-        except exceptions.RentalException as e:
-            messagebox.showerror("Error", f"Reservation failed with error: {e}")
-            return
-        messagebox.showinfo("Success", "Reservation cancelled successfully")
+
+        def cancel_reservation():
+            requests.cancel_booking(self._find_booking(user_name, property_name).id)
+
+        self._run_handler(
+            "cancel_reservation",
+            cancel_reservation,
+            lambda _: messagebox.showinfo(
+                "Success", "Reservation cancelled successfully"
+            ),
+        )
 
     def on_update_reservation(self):
         user_name, property_name = self._get_user_property_from_combo_box("u")
@@ -143,77 +223,147 @@ class RentalApp:
         if start_date == "" or end_date == "":
             messagebox.showerror("Error", "Please enter a start and end date")
             return
-        try:
-            user = models.User.objects.filter(name=user_name).first()
-            property = models.RentalProperty.objects.filter(name=property_name).first()
-            booking = (
-                models.RentalBooking.objects.filter(
-                    user_id=user.id, rental_id=property.id
-                )
-                .allow_filtering()
-                .first()
+
+        def update_reservation():
+            self._find_booking(user_name, property_name).update(
+                start_date=start_date, end_date=end_date
             )
-            booking.update(start_date=start_date, end_date=end_date)
-        except models.User.DoesNotExist:
-            messagebox.showerror("Error", "Bad user/property name")
-            return
-        except exceptions.RentalException as e:
-            messagebox.showerror("Error", f"Reservation failed with error: {e}")
-            return
-        messagebox.showinfo("Success", "Reservation made successfully")
+
+        self._run_handler(
+            "update_reservation",
+            update_reservation,
+            lambda _: messagebox.showinfo("Success", "Reservation made successfully"),
+        )
+
+    def _fetch_reservations_page(
+        self, query: paging.PagedQuery, paging_state: bytes | None
+    ) -> tuple[list, bytes | None]:
+        page = query.fetch(paging_state)
+        properties = models.RentalProperty.get_many(
+            row["rental_id"] for row in page.rows
+        )
+        entries = [
+            [
+                (
+                    properties[row["rental_id"]].name
+                    if row["rental_id"] in properties
+                    else row["rental_id"]
+                ),
+                row["start_date"],
+                row["end_date"],
+            ]
+            for row in page.rows
+        ]
+        return entries, page.paging_state
 
     def on_view_reservations(self):
         user_name, property_name = self._get_user_property_from_combo_box("v")
         if user_name == "" and property_name == "":
             messagebox.showerror("Error", "Please select a user or a property")
             return
-        try:
-            user = models.User.objects.filter(name=user_name).first()
-            property = models.RentalProperty.objects.filter(name=property_name).first()
+
+        def view_reservations():
+            user_id = name_lookup.resolve(models.User, user_name)
+            property_id = name_lookup.resolve(models.RentalProperty, property_name)
             filter_params = {}
-            if user is not None:
-                filter_params["user_id"] = user.id
-            if property is not None:
-                filter_params["rental_id"] = property.id
-            bookings = (
-                models.RentalBooking.objects.filter(**filter_params)
-                .allow_filtering()
-                .values_list("rental_id", "start_date", "end_date")
+            if user_id is not None:
+                filter_params["user_id"] = user_id
+            if property_id is not None:
+                filter_params["rental_id"] = property_id
+            query = paging.PagedQuery(
+                (
+                    models.RentalBookingByProperty
+                    if property_id is not None
+                    else models.RentalBooking
+                ),
+                ["rental_id", "start_date", "end_date"],
+                filter_params,
+                allow_filtering=user_id is not None,
             )
-            if len(bookings) == 0:
+            fetch_page = partial(self._fetch_reservations_page, query)
+            return fetch_page, fetch_page(None)
+
+        def show_reservations(result):
+            fetch_page, first_page = result
+            if not self.ui.main_frame.vr_table.set_source(
+                fetch_page,
+                partial(self.worker.submit, "reservations_page"),
+                first_page,
+                self._show_handler_error,
+            ):
                 messagebox.showinfo("Success", "No bookings found")
-                return
 
-            for booking in bookings:
-                property = models.RentalProperty.objects.get(id=booking[0])
-                booking[0] = property.name
-            self.ui.main_frame.vr_table.entries = bookings
-            self.ui.main_frame.vr_table.update_entries()
-
-        except models.User.DoesNotExist:
-            messagebox.showerror("Error", "Bad user/property name")
-            return
-        except exceptions.RentalException as e:
-            messagebox.showerror("Error", f"Reservation failed with error: {e}")
+        self._run_handler("view_reservations", view_reservations, show_reservations)
+
+    def _fetch_available_page(
+        self,
+        available: list[tuple[uuid.UUID, str, float]],
+        booked_days: dict[uuid.UUID, int],
+        offset: int | None,
+    ) -> tuple[list, int | None]:
+        start = offset or 0
+        stop = start + paging.DEFAULT_PAGE_SIZE
+        entries = [
+            [name, price, booked_days.get(property_id, 0)]
+            for property_id, name, price in available[start:stop]
+        ]
+        return entries, stop if stop < len(available) else None
+
+    def on_search_availability(self):
+        start_date = self.ui.component_registry.get_entry("a_start_date_entry").get()
+        end_date = self.ui.component_registry.get_entry("a_end_date_entry").get()
+        if start_date == "" or end_date == "":
+            messagebox.showerror("Error", "Please enter a start and end date")
             return
 
+        def search_availability():
+            available = models.availability_index.available(start_date, end_date)
+            month = occupancy.to_date(start_date)
+            booked_days = models.occupancy_index.month_occupancy(
+                month.year, month.month
+            )
+            fetch_page = partial(self._fetch_available_page, available, booked_days)
+            return fetch_page, fetch_page(None)
+
+        def show_available(result):
+            fetch_page, first_page = result
+            if not self.ui.main_frame.av_table.set_source(
+                fetch_page,
+                partial(self.worker.submit, "availability_page"),
+                first_page,
+                self._show_handler_error,
+            ):
+                messagebox.showinfo("Success", "No properties are free in that range")
+
+        self._run_handler("search_availability", search_availability, show_available)
+
     def set_mock_data_dir(self, mock_data_dir: Path):
         self.mock_data_dir = mock_data_dir
 
+    def set_snapshot_dir(self, snapshot_dir: Path):
+        self.snapshot_dir = snapshot_dir
+
     def run(self):
         self.root.mainloop()
-
-    def update_labels_from_sync_table(self):
-        sync_copy = self.sync_table.copy()
-        for key, value in sync_copy.items():
-            self.ui.set_label_text(key, str(value))
-        self.root.update()
+        self.worker.shutdown()
 
     def setup_button_callbacks(self):
         self.register_long_action(self.on_clear_database, "clear_database", "DB Clear")
         self.register_long_action(
             self.on_repopulate_database, "repopulate_database", "DB Repopulate"
         )
+        self.register_long_action(
+            self.on_recount_models, "recount_models", "Exact Recount"
+        )
+        self.register_long_action(
+            self.on_rebuild_side_tables, "rebuild_side_tables", "Side Table Rebuild"
+        )
+        self.register_long_action(
+            self.on_save_snapshot, "save_snapshot", "Snapshot Save"
+        )
+        self.register_long_action(
+            self.on_restore_snapshot, "restore_snapshot", "Snapshot Restore"
+        )
         self.register_long_action(
             self.on_refresh_inputs, "refresh_button", "Refresh Inputs"
         )
@@ -243,6 +393,10 @@ class RentalApp:
             "Random Actions Test [4]",
         )
 
+        for kind, index in self.name_indexes.items():
+            for prefix in ["mr", "c", "u", "v"]:
+                self.ui.add_combo_box_search(f"{prefix}_{kind}_combo_box", index.search)
+
         self.ui.add_btn_command(
             "mr_submit_button",
             self.on_make_reservation,
@@ -259,11 +413,15 @@ class RentalApp:
             "v_submit_button",
             self.on_view_reservations,
         )
+        self.ui.add_btn_command(
+            "a_submit_button",
+            self.on_search_availability,
+        )
 
     def initialize_connection(self):
         try:
             self.cassandra_handler.setup(
-                models.MODELS,
+                models.ALL_MODELS,
                 lambda progress, status: self.loading_box.set_progress(
                     progress / 100, status
                 )
@@ -282,21 +440,20 @@ class RentalApp:
         def on_start():
             for btn in self.ui.component_registry.button_registry.values():
                 btn.configure(state="disabled")
-            self.sync_table["status_value"] = f"Running {name}..."
+            self.updates.publish("status_value", f"Running {name}...")
 
         def on_complete():
             self.reload_model_counts()
             for btn in self.ui.component_registry.button_registry.values():
                 btn.configure(state="normal")
-            self.sync_table["status_value"] = "Idle"
+            self.updates.publish("status_value", "Idle")
 
         def timer_wrapped_action():
             with Timer() as timer:
                 action_result = action()
-            self.sync_table["time_value"] = f"{timer.elapsed():.2f}s"
+            self.updates.publish("time_value", f"{timer.elapsed():.2f}s")
             if action_result is not None:
-                for key, value in action_result.items():
-                    self.sync_table[key] = value
+                self.updates.publish_many(action_result)
 
         self.ui.add_btn_command(
             btn_tag,
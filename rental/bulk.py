@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import collections
+import multiprocessing
+import os
+import time
+import typing
+import uuid
+
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import cassandra.cqlengine.models as cqlm
+
+from .cassio import CassandraHandler
+from .data import mock, models
+from .util import chunks
+
+SHARD_SIZE = 5_000
+SHARDS_PER_WORKER = 2
+
+
+class BulkLoadProgress(typing.NamedTuple):
+    model_name: str
+    model_rows: int
+    total_rows: int
+    rows_per_second: float
+
+
+def _connect_worker(cassandra_spec: dict) -> None:
+    CassandraHandler(**cassandra_spec).connect()
+
+
+def _load_shard(
+    model: typing.Type[cqlm.Model],
+    rows: list[dict],
+    concurrency: int,
+    collect_ids: bool,
+) -> tuple[int, list[uuid.UUID]]:
+    created_ids = [] if collect_ids else None
+    loaded = mock.load_rows(model, rows, concurrency, created_ids)
+    return loaded, created_ids or []
+
+
+class _ShardedLoader:
+    def __init__(
+        self,
+        executor: ProcessPoolExecutor,
+        workers: int,
+        concurrency: int,
+        progress_callback: typing.Callable[[BulkLoadProgress], None],
+    ) -> None:
+        self.executor = executor
+        self.max_pending = workers * SHARDS_PER_WORKER
+        self.concurrency = concurrency
+        self.progress_callback = progress_callback
+        self.total_rows = 0
+        self.model_rows = 0
+        self.started_at = time.perf_counter()
+
+    def _collect(
+        self,
+        done: typing.Iterable[Future],
+        model: typing.Type[cqlm.Model],
+        created_ids: list[uuid.UUID],
+    ) -> None:
+        for future in done:
+            loaded, shard_ids = future.result()
+            created_ids.extend(shard_ids)
+            self.model_rows += loaded
+            self.total_rows += loaded
+        elapsed = time.perf_counter() - self.started_at
+        self.progress_callback(
+            BulkLoadProgress(
+                model_name=model.__name__,
+                model_rows=self.model_rows,
+                total_rows=self.total_rows,
+                rows_per_second=self.total_rows / elapsed if elapsed > 0 else 0.0,
+            )
+        )
+
+    def _shards(
+        self, rows: typing.Iterable[dict], partition_key: str | None
+    ) -> typing.Iterator[tuple[int, list[dict]]]:
+        if partition_key is None:
+            yield from enumerate(chunks(rows, SHARD_SIZE))
+            return
+        buckets = collections.defaultdict(list)
+        for row in rows:
+            bucket = uuid.UUID(str(row[partition_key])).int % self.max_pending
+            buckets[bucket].append(row)
+            if len(buckets[bucket]) >= SHARD_SIZE:
+                yield bucket, buckets.pop(bucket)
+        yield from buckets.items()
+
+    def load(
+        self,
+        model: typing.Type[cqlm.Model],
+        rows: typing.Iterable[dict],
+        collect_ids: bool = False,
+        partition_key: str | None = None,
+    ) -> list[uuid.UUID]:
+        created_ids = []
+        self.model_rows = 0
+        pending: dict[int, Future] = {}
+        for bucket, shard in self._shards(rows, partition_key):
+            while bucket in pending or len(pending) >= self.max_pending:
+                done, _ = wait(pending.values(), return_when=FIRST_COMPLETED)
+                self._collect(done, model, created_ids)
+                pending = {
+                    key: future for key, future in pending.items() if future not in done
+                }
+            pending[bucket] = self.executor.submit(
+                _load_shard, model, shard, self.concurrency, collect_ids
+            )
+        if pending:
+            done, _ = wait(pending.values())
+            self._collect(done, model, created_ids)
+        return created_ids
+
+
+def load_mock_data_sharded(
+    mock_data_dir: Path,
+    cassandra_spec: dict,
+    workers: int | None = None,
+    concurrency: int = mock.WRITE_CONCURRENCY,
+    progress_callback: typing.Callable[[BulkLoadProgress], None] = lambda _: None,
+) -> int:
+    workers = workers or os.cpu_count() or 1
+    with models.occupancy_index.bulk_load(), ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_connect_worker,
+        initargs=(cassandra_spec,),
+    ) as executor:
+        loader = _ShardedLoader(executor, workers, concurrency, progress_callback)
+        user_ids = loader.load(
+            models.User,
+            mock.iter_records(mock.data_path(mock_data_dir, "users")),
+            collect_ids=True,
+        )
+        property_ids = loader.load(
+            models.RentalProperty,
+            mock.iter_records(mock.data_path(mock_data_dir, "properties")),
+            collect_ids=True,
+        )
+        for model, name in (
+            (models.RentalBooking, "bookings"),
+            (models.RentalReview, "reviews"),
+        ):
+            loader.load(
+                model,
+                mock.with_references(
+                    mock.iter_records(mock.data_path(mock_data_dir, name)),
+                    user_ids,
+                    property_ids,
+                ),
+                partition_key="rental_id",
+            )
+    return loader.total_rows
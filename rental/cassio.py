@@ -1,13 +1,16 @@
 import cassandra.cqlengine.connection as cql_conn
 import cassandra.cqlengine.management as cql_mgmt
 import cassandra.cqlengine.models as cqlm
-import cassandra.cqlengine.query as cql_query
 
-from cassandra import InvalidRequest, ConsistencyLevel
+from cassandra import InvalidRequest
 
-from typing import Callable
+from pathlib import Path
+from typing import Callable, Mapping
 
-from rental.util import chunks
+from rental.data import consistency, counters, prepared, scan, snapshot, writes
+from rental.data import models as data_models
+from rental.data.cache import existence_cache, name_cache, row_cache
+from rental.profiles import ExecutionProfileSpec
 
 
 class CassandraHandler:
@@ -16,12 +19,29 @@ class CassandraHandler:
         hosts: list[str],
         keyspace: str,
         replication_factor: int = 1,
+        execution_profile: Mapping | None = None,
+        consistency_policy: Mapping | None = None,
     ) -> None:
         self.hosts = hosts
         self.keyspace = keyspace
         self.replication_factor = replication_factor
+        self.execution_profile = ExecutionProfileSpec.from_mapping(execution_profile)
+        consistency.configure(consistency_policy)
         self.__initialized = False
 
+    def connect(self) -> None:
+        cql_conn.setup(
+            self.hosts,
+            self.keyspace,
+            retry_connect=True,
+            consistency=consistency.level(consistency.Operation.WRITE),
+            **self.execution_profile.cluster_options(
+                consistency.level(consistency.Operation.WRITE),
+                consistency.level(consistency.Operation.SERIAL),
+            ),
+        )
+        self.execution_profile.configure_pool(cql_conn.cluster)
+
     def setup(
         self,
         models: list[type[cqlm.Model]],
@@ -30,20 +50,17 @@ class CassandraHandler:
         if self.__initialized:
             raise RuntimeError("CassandraHandler already initialized")
         progress_callback(5, "Connecting to Cassandra")
-        cql_conn.setup(
-            self.hosts,
-            self.keyspace,
-            retry_connect=True,
-            consistency=ConsistencyLevel.QUORUM,
-        )
+        self.connect()
         progress_callback(20, "Creating keyspace")
         cql_mgmt.create_keyspace_simple(self.keyspace, self.replication_factor)
         len_models = len(models)
         for i, model in enumerate(models):
             progress_callback(
-                40 + 60 * (i + 1) / len_models, f"Syncing {model.__name__}"
+                40 + 50 * (i + 1) / len_models, f"Syncing {model.__name__}"
             )
             cql_mgmt.sync_table(model)
+        progress_callback(95, "Preparing statements")
+        prepared.prepare_statements()
         self.__initialized = True
 
     def teardown(self) -> None:
@@ -55,24 +72,63 @@ class CassandraHandler:
         if not self.__initialized:
             raise RuntimeError("CassandraHandler not initialized")
 
-        if not safe:
-            for model in models:
+        for model in models:
+            if not safe:
                 try:
                     cql_conn.session.execute(
                         f"TRUNCATE {self.keyspace}.{model._table_name}"
                     )
                 except InvalidRequest:
-                    continue
-            return
+                    pass
+            elif counters.is_counter_model(model):
+                counters.reset_all()
+            else:
+                keys = scan.scan_primary_keys(
+                    model, operation=consistency.Operation.CONFLICT_CHECK
+                )
+                writes.execute_grouped(writes.delete_statements(model, keys), [model])
+            existence_cache(model).clear()
+            row_cache(model).clear()
+            name_cache(model).clear()
 
-        for model in models:
-            all_objects = model.objects.all()
-            for model_batch in chunks(all_objects, 100):
-                with cql_query.BatchQuery() as batch:
-                    for obj in model_batch:
-                        obj.batch(batch).delete()
+    def export_snapshot(
+        self, snapshot_dir: Path, models: list[type[cqlm.Model]]
+    ) -> dict[str, int]:
+        if not self.__initialized:
+            raise RuntimeError("CassandraHandler not initialized")
+        snapshot_dir.mkdir(parents=True, exist_ok=True)
+        return {
+            model.__name__: snapshot.export_table(
+                model, snapshot.snapshot_path(snapshot_dir, model)
+            )
+            for model in models
+            if not counters.is_counter_model(model)
+        }
+
+    def import_snapshot(
+        self, snapshot_dir: Path, models: list[type[cqlm.Model]]
+    ) -> dict[str, int]:
+        if not self.__initialized:
+            raise RuntimeError("CassandraHandler not initialized")
+        paths = {
+            model: snapshot.snapshot_path(snapshot_dir, model)
+            for model in models
+            if not counters.is_counter_model(model)
+        }
+        missing = [str(path) for path in paths.values() if not path.exists()]
+        if missing:
+            raise FileNotFoundError(f"Missing snapshot files: {missing}")
+        self.clear_tables(models, safe=False)
+        imported = {}
+        for model, path in paths.items():
+            imported[model.__name__] = snapshot.import_table(model, path)
+            existence_cache(model).clear()
+            if model in data_models.MODELS:
+                counters.set_count(model, imported[model.__name__])
+        return imported
 
     def close(self) -> None:
+        prepared.reset()
         cql_conn.cluster.shutdown()
 
     def __del__(self) -> None:
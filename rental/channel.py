@@ -0,0 +1,51 @@
+import queue
+
+from typing import Any, Callable, Mapping
+
+MIN_INTERVAL_MS = 16
+MAX_IDLE_INTERVAL_MS = 500
+
+
+class UpdateChannel:
+    def __init__(
+        self,
+        root,
+        apply: Callable[[str, Any], None],
+        min_interval_ms: int = MIN_INTERVAL_MS,
+        max_idle_interval_ms: int = MAX_IDLE_INTERVAL_MS,
+    ) -> None:
+        self.root = root
+        self.apply = apply
+        self.min_interval_ms = min_interval_ms
+        self.max_idle_interval_ms = max_idle_interval_ms
+        self.interval_ms = min_interval_ms
+        self.applied: dict[str, Any] = {}
+        self._updates: queue.SimpleQueue[tuple[str, Any]] = queue.SimpleQueue()
+
+    def publish(self, key: str, value: Any) -> None:
+        self._updates.put((key, value))
+
+    def publish_many(self, updates: Mapping[str, Any]) -> None:
+        for key, value in updates.items():
+            self.publish(key, value)
+
+    def drain(self) -> None:
+        latest = {}
+        while True:
+            try:
+                key, value = self._updates.get_nowait()
+            except queue.Empty:
+                break
+            latest[key] = value
+        for key, value in latest.items():
+            if self.applied.get(key) != value:
+                self.applied[key] = value
+                self.apply(key, value)
+        if latest:
+            self.interval_ms = self.min_interval_ms
+        else:
+            self.interval_ms = min(self.interval_ms * 2, self.max_idle_interval_ms)
+        self.root.after(self.interval_ms, self.drain)
+
+    def start(self) -> None:
+        self.root.after(self.min_interval_ms, self.drain)
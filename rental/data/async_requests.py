@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import types
+import typing
+import uuid
+
+import cassandra.cqlengine.connection as cql_conn
+import cassandra.cqlengine.models as cqlm
+
+from cassandra.cluster import ResponseFuture
+from cassandra.query import BatchStatement, BoundStatement, SimpleStatement
+
+from .. import exceptions
+from . import claims, columns, counters, models, prepared
+from .cache import existence_cache
+
+_T = typing.TypeVar("_T")
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_pid: int | None = None
+_loop_lock = threading.Lock()
+
+
+def _event_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _loop_pid
+    with _loop_lock:
+        if _loop is None or _loop_pid != os.getpid():
+            _loop = asyncio.new_event_loop()
+            _loop_pid = os.getpid()
+            threading.Thread(
+                target=_loop.run_forever, name="async-requests", daemon=True
+            ).start()
+        return _loop
+
+
+def run(coroutine: typing.Coroutine[typing.Any, typing.Any, _T]) -> _T:
+    return asyncio.run_coroutine_threadsafe(coroutine, _event_loop()).result()
+
+
+def _set_result(future: asyncio.Future, result: typing.Any) -> None:
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_exception(future: asyncio.Future, exception: BaseException) -> None:
+    if not future.done():
+        future.set_exception(exception)
+
+
+def wrap_response_future(response_future: ResponseFuture) -> asyncio.Future:
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    rows = []
+
+    def on_page(page: typing.Iterable) -> None:
+        rows.extend(page)
+        if response_future.has_more_pages:
+            response_future.start_fetching_next_page()
+        else:
+            loop.call_soon_threadsafe(_set_result, future, rows)
+
+    response_future.add_callbacks(
+        callback=on_page,
+        errback=lambda exc: loop.call_soon_threadsafe(_set_exception, future, exc),
+    )
+    return future
+
+
+async def execute_async(
+    statement: str | SimpleStatement | BatchStatement,
+    params: typing.Sequence | None = None,
+) -> list[dict]:
+    session = cql_conn.get_session()
+    return await wrap_response_future(session.execute_async(statement, params))
+
+
+async def execute_prepared(
+    model: typing.Type[cqlm.Model], operation: str, values: typing.Mapping
+) -> list[dict]:
+    return await execute_async(prepared.bind(model, operation, values))
+
+
+async def _execute_batch(statements: list[BoundStatement]) -> None:
+    batch = BatchStatement()
+    for statement in statements:
+        batch.add(statement)
+    await execute_async(batch)
+
+
+async def _exists(model: typing.Type[cqlm.Model], instance_id: uuid.UUID) -> bool:
+    known_ids = existence_cache(model)
+    if instance_id in known_ids:
+        return True
+    rows = await execute_prepared(model, "exists", {"id": instance_id})
+    if not rows:
+        return False
+    known_ids.put(instance_id)
+    return True
+
+
+async def _validate_foreign_keys(
+    model: typing.Type[models._IdentifieableValidatedModel], values: dict
+) -> None:
+    references = [
+        (column.ref_model, values[column_name])
+        for column_name, column in model._columns.items()
+        if isinstance(column, columns.ForeignUUID)
+        and values.get(column_name) is not None
+    ]
+    found = await asyncio.gather(
+        *(_exists(ref_model, ref_id) for ref_model, ref_id in references)
+    )
+    for (ref_model, ref_id), exists in zip(references, found):
+        if not exists:
+            raise exceptions.NonExistentForeignKeyException(
+                f"Instance of {ref_model} with id={ref_id} does not exist"
+            )
+
+
+async def _acquire_claims(
+    held_claims: typing.Iterable[claims.Claim], owner_id: uuid.UUID
+) -> None:
+    acquired = []
+    for claim in sorted(held_claims, key=claims.Claim.sort_key):
+        rows = await execute_prepared(
+            claim.model, "acquire", {**dict(claim.key), "owner_id": owner_id}
+        )
+        if rows[0]["[applied]"]:
+            acquired.append(claim)
+        elif rows[0].get("owner_id") != owner_id:
+            await _release_claims(acquired, owner_id)
+            raise claim.conflict()
+
+
+async def _release_claims(
+    held_claims: typing.Iterable[claims.Claim], owner_id: uuid.UUID
+) -> None:
+    await asyncio.gather(
+        *(
+            execute_prepared(
+                claim.model, "release", {**dict(claim.key), "owner_id": owner_id}
+            )
+            for claim in held_claims
+        )
+    )
+
+
+async def _increment_count(model: typing.Type[cqlm.Model], delta: int) -> None:
+    await execute_async(counters.increment_statement(), (delta, model.__name__))
+
+
+async def _has_overlapping_booking(values: dict) -> bool:
+    if models.occupancy_index.is_known_free(
+        values["rental_id"], values["start_date"], values["end_date"]
+    ):
+        return False
+    rows = await execute_prepared(models.RentalBookingByProperty, "overlap", values)
+    return any(
+        row["end_date"].date() >= values["start_date"] and row["id"] != values["id"]
+        for row in rows
+    )
+
+
+async def _get_row(
+    model: typing.Type[cqlm.Model], instance_id: uuid.UUID
+) -> dict | None:
+    rows = await execute_prepared(model, "get", {"id": instance_id})
+    return rows[0] if rows else None
+
+
+def _run_validators(
+    model: typing.Type[models._IdentifieableValidatedModel], values: dict
+) -> None:
+    instance_view = types.SimpleNamespace(**values)
+    for validator in model.validators:
+        validator(instance_view)
+
+
+async def _create_booking(
+    user_id: uuid.UUID, property_id: uuid.UUID, start_date: str, end_date: str
+) -> uuid.UUID:
+    for field_name, value in (("start_date", start_date), ("end_date", end_date)):
+        if value == "" or value is None:
+            raise exceptions.BadValueException(f"{field_name} must be non-empty")
+    date_column = models.RentalBooking._columns["start_date"]
+    values = {
+        "id": uuid.uuid4(),
+        "user_id": user_id,
+        "rental_id": property_id,
+        "start_date": date_column.to_python(start_date).date(),
+        "end_date": date_column.to_python(end_date).date(),
+    }
+    if values["start_date"] > values["end_date"]:
+        raise exceptions.BadValueException("Start date must be before end date")
+
+    _, overlapping = await asyncio.gather(
+        _validate_foreign_keys(models.RentalBooking, values),
+        _has_overlapping_booking(values),
+    )
+    if overlapping:
+        raise exceptions.OverlappingBookingException(
+            "This booking overlaps with an existing booking"
+        )
+
+    booking_claims = models.RentalBooking.get_claims(values)
+    await _acquire_claims(booking_claims, values["id"])
+    try:
+        await _execute_batch(
+            [
+                prepared.bind(models.RentalBooking, "insert", values),
+                prepared.bind(models.RentalBookingByProperty, "insert", values),
+            ]
+        )
+    except Exception:
+        await _release_claims(booking_claims, values["id"])
+        raise
+    models.RentalBooking.after_write(values, None)
+    await _increment_count(models.RentalBooking, 1)
+    return values["id"]
+
+
+async def make_reservation_async(
+    user_id: uuid.UUID,
+    property_id: uuid.UUID,
+    start_date: str,
+    end_date: str,
+    ignore_errors: bool = True,
+) -> uuid.UUID | None:
+    try:
+        return await _create_booking(user_id, property_id, start_date, end_date)
+    except (
+        exceptions.OverlappingBookingException,
+        exceptions.UniqueFieldsRestrictionViolationException,
+    ):
+        if not ignore_errors:
+            raise
+        return None
+
+
+async def _create_review(
+    user_id: uuid.UUID, property_id: uuid.UUID, rating: int, comment: str
+) -> uuid.UUID:
+    values = {
+        "id": uuid.uuid4(),
+        "rating": rating,
+        "comment": comment,
+        "rental_id": property_id,
+        "user_id": user_id,
+    }
+    _run_validators(models.RentalReview, values)
+    await _validate_foreign_keys(models.RentalReview, values)
+
+    review_claims = models.RentalReview.get_claims(values)
+    await _acquire_claims(review_claims, values["id"])
+    try:
+        await execute_prepared(models.RentalReview, "insert", values)
+    except Exception:
+        await _release_claims(review_claims, values["id"])
+        raise
+    models.RentalReview.after_write(values, None)
+    await _increment_count(models.RentalReview, 1)
+    return values["id"]
+
+
+async def add_review_async(
+    user_id: uuid.UUID,
+    property_id: uuid.UUID,
+    rating: int,
+    comment: str,
+    ignore_errors: bool = True,
+) -> uuid.UUID | None:
+    try:
+        return await _create_review(user_id, property_id, rating, comment)
+    except (
+        exceptions.BadValueException,
+        exceptions.UniqueFieldsRestrictionViolationException,
+    ):
+        if not ignore_errors:
+            raise
+        return None
+
+
+async def cancel_booking_async(booking_id: uuid.UUID) -> bool:
+    booking = await _get_row(models.RentalBooking, booking_id)
+    if booking is None:
+        return False
+    await _execute_batch(
+        [
+            prepared.bind(models.RentalBookingByProperty, "delete", booking),
+            prepared.bind(models.RentalBooking, "delete", booking),
+        ]
+    )
+    models.RentalBooking.after_delete(booking)
+    await asyncio.gather(
+        _release_claims(models.RentalBooking.get_claims(booking), booking_id),
+        _increment_count(models.RentalBooking, -1),
+    )
+    return True
+
+
+async def withdraw_review_async(review_id: uuid.UUID) -> bool:
+    review = await _get_row(models.RentalReview, review_id)
+    if review is None:
+        return False
+    await execute_prepared(models.RentalReview, "delete", review)
+    models.RentalReview.after_delete(review)
+    await asyncio.gather(
+        _release_claims(models.RentalReview.get_claims(review), review_id),
+        _increment_count(models.RentalReview, -1),
+    )
+    return True
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import bisect
+import datetime
+import threading
+import time
+import typing
+import uuid
+
+from concurrent.futures import ThreadPoolExecutor
+
+from .. import exceptions
+
+LOAD_TTL = 60.0
+
+PropertyRow = tuple[uuid.UUID, str, float]
+BookingRow = tuple[uuid.UUID, uuid.UUID, typing.Any, typing.Any]
+
+
+def _ordinal(value: typing.Any) -> int:
+    if isinstance(value, str):
+        return datetime.date.fromisoformat(value).toordinal()
+    if isinstance(value, datetime.date):
+        return value.toordinal()
+    return value.date().toordinal()
+
+
+class PropertyIntervals:
+    def __init__(self) -> None:
+        self.starts: list[int] = []
+        self.ends: list[int] = []
+        self.booking_ids: list[uuid.UUID] = []
+
+    def add(self, booking_id: uuid.UUID, start: int, end: int) -> None:
+        position = bisect.bisect_right(self.starts, start)
+        self.starts.insert(position, start)
+        self.ends.insert(position, end)
+        self.booking_ids.insert(position, booking_id)
+
+    def remove(self, booking_id: uuid.UUID) -> None:
+        if booking_id in self.booking_ids:
+            position = self.booking_ids.index(booking_id)
+            del self.starts[position]
+            del self.ends[position]
+            del self.booking_ids[position]
+
+    def is_free(self, start: int, end: int) -> bool:
+        position = bisect.bisect_right(self.starts, end)
+        return position == 0 or self.ends[position - 1] < start
+
+
+class AvailabilityIndex:
+    def __init__(
+        self,
+        load_properties: typing.Callable[[], typing.Iterable[PropertyRow]],
+        load_bookings: typing.Callable[[], typing.Iterable[BookingRow]],
+        ttl: float = LOAD_TTL,
+    ) -> None:
+        self.load_properties = load_properties
+        self.load_bookings = load_bookings
+        self.ttl = ttl
+        self.properties: dict[uuid.UUID, tuple[str, float]] = {}
+        self.intervals: dict[uuid.UUID, PropertyIntervals] = {}
+        self.loaded_at: float | None = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _load_properties(self) -> dict[uuid.UUID, tuple[str, float]]:
+        return {
+            property_id: (name, price)
+            for property_id, name, price in self.load_properties()
+        }
+
+    def _load_intervals(self) -> dict[uuid.UUID, PropertyIntervals]:
+        intervals = {}
+        for property_id, booking_id, start_date, end_date in self.load_bookings():
+            property_intervals = intervals.get(property_id)
+            if property_intervals is None:
+                property_intervals = intervals[property_id] = PropertyIntervals()
+            property_intervals.add(booking_id, _ordinal(start_date), _ordinal(end_date))
+        return intervals
+
+    def rebuild(
+        self,
+    ) -> tuple[dict[uuid.UUID, tuple[str, float]], dict[uuid.UUID, PropertyIntervals]]:
+        with self._lock:
+            generation = self._generation
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            properties = executor.submit(self._load_properties)
+            intervals = executor.submit(self._load_intervals)
+            properties, intervals = properties.result(), intervals.result()
+        with self._lock:
+            if generation == self._generation:
+                self.properties = properties
+                self.intervals = intervals
+                self.loaded_at = time.monotonic()
+        return properties, intervals
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self.loaded_at = None
+            self.properties = {}
+            self.intervals = {}
+
+    def put_property(self, property_id: uuid.UUID, name: str, price: float) -> None:
+        with self._lock:
+            if self.loaded_at is not None:
+                self.properties[property_id] = (name, price)
+
+    def remove_property(self, property_id: uuid.UUID) -> None:
+        with self._lock:
+            self.properties.pop(property_id, None)
+            self.intervals.pop(property_id, None)
+
+    def add_booking(
+        self, property_id: uuid.UUID, booking_id: uuid.UUID, start_date, end_date
+    ) -> None:
+        with self._lock:
+            if self.loaded_at is None:
+                return
+            property_intervals = self.intervals.get(property_id)
+            if property_intervals is None:
+                property_intervals = self.intervals[property_id] = PropertyIntervals()
+            property_intervals.add(booking_id, _ordinal(start_date), _ordinal(end_date))
+
+    def remove_booking(self, property_id: uuid.UUID, booking_id: uuid.UUID) -> None:
+        with self._lock:
+            if property_id in self.intervals:
+                self.intervals[property_id].remove(booking_id)
+
+    def _is_fresh(self) -> bool:
+        return (
+            self.loaded_at is not None and time.monotonic() - self.loaded_at <= self.ttl
+        )
+
+    def available(
+        self, start_date: typing.Any, end_date: typing.Any
+    ) -> list[tuple[uuid.UUID, str, float]]:
+        start, end = _ordinal(start_date), _ordinal(end_date)
+        if start > end:
+            raise exceptions.BadValueException("Start date must be before end date")
+        with self._lock:
+            fresh = self._is_fresh()
+            properties, intervals = self.properties, self.intervals
+        if not fresh:
+            properties, intervals = self.rebuild()
+        empty = PropertyIntervals()
+        with self._lock:
+            return sorted(
+                (
+                    (property_id, name, price)
+                    for property_id, (name, price) in properties.items()
+                    if intervals.get(property_id, empty).is_free(start, end)
+                ),
+                key=lambda entry: entry[1],
+            )
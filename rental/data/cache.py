@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import collections
+import threading
+import time
+import typing
+
+_MISSING = object()
+
+
+class BoundedCache:
+    def __init__(self, max_size: int = 10_000, ttl: float | None = 60.0) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: collections.OrderedDict[
+            typing.Hashable, tuple[float, typing.Any]
+        ] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: typing.Hashable, default: typing.Any = None) -> typing.Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING and self._is_expired(entry[0]):
+                del self._entries[key]
+                entry = _MISSING
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def __contains__(self, key: typing.Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def put(self, key: typing.Hashable, value: typing.Any = True) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: typing.Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
+
+    def _is_expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.monotonic() - stored_at > self.ttl
+
+
+_existence_caches: dict[type, BoundedCache] = {}
+_existence_caches_lock = threading.Lock()
+
+
+def existence_cache(model: type) -> BoundedCache:
+    with _existence_caches_lock:
+        if model not in _existence_caches:
+            _existence_caches[model] = BoundedCache()
+        return _existence_caches[model]
+
+
+def configure_existence_cache(
+    model: type, max_size: int = 10_000, ttl: float | None = 60.0
+) -> BoundedCache:
+    with _existence_caches_lock:
+        _existence_caches[model] = BoundedCache(max_size=max_size, ttl=ttl)
+        return _existence_caches[model]
+
+
+def existence_cache_stats() -> dict[str, dict[str, int]]:
+    with _existence_caches_lock:
+        caches = list(_existence_caches.items())
+    return {model.__name__: model_cache.stats() for model, model_cache in caches}
+
+
+_name_caches: dict[type, BoundedCache] = {}
+_name_caches_lock = threading.Lock()
+
+
+def name_cache(model: type) -> BoundedCache:
+    with _name_caches_lock:
+        if model not in _name_caches:
+            _name_caches[model] = BoundedCache()
+        return _name_caches[model]
+
+
+_row_caches: dict[type, BoundedCache] = {}
+_row_caches_lock = threading.Lock()
+
+
+def row_cache(model: type) -> BoundedCache:
+    with _row_caches_lock:
+        if model not in _row_caches:
+            _row_caches[model] = BoundedCache()
+        return _row_caches[model]
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import collections
+import datetime
+import itertools
+import typing
+import uuid
+
+import cassandra.cqlengine.columns as cql_columns
+import cassandra.cqlengine.models as cqlm
+import cassandra.cqlengine.query as cql_query
+
+from concurrent.futures import Executor
+
+from .. import exceptions
+from ..util import chunks
+from . import consistency
+
+
+class RentalDayClaim(cqlm.Model):
+    __table_name__ = "rental_day_claim"
+
+    rental_id: uuid.UUID = cql_columns.UUID(partition_key=True)
+    day: str = cql_columns.Date(partition_key=True)
+    owner_id: uuid.UUID = cql_columns.UUID(required=True)
+
+    conflict_exception = exceptions.OverlappingBookingException
+    conflict_message = "This booking overlaps with an existing booking"
+
+
+class UniqueFieldsClaim(cqlm.Model):
+    __table_name__ = "unique_fields_claim"
+
+    constraint: str = cql_columns.Text(partition_key=True)
+    value: str = cql_columns.Text(partition_key=True)
+    owner_id: uuid.UUID = cql_columns.UUID(required=True)
+
+    conflict_exception = exceptions.UniqueFieldsRestrictionViolationException
+    conflict_message = (
+        "An object with the same values for unique fields {constraint} already exists"
+    )
+
+
+CLAIM_MODELS = [RentalDayClaim, UniqueFieldsClaim]
+
+
+class Claim(typing.NamedTuple):
+    model: typing.Type[cqlm.Model]
+    key: tuple[tuple[str, typing.Any], ...]
+
+    @classmethod
+    def make(cls, model: typing.Type[cqlm.Model], **key) -> Claim:
+        return cls(model=model, key=tuple(sorted(key.items())))
+
+    def sort_key(self) -> tuple:
+        return self.model.__name__, tuple(str(value) for _, value in self.key)
+
+    def conflict(self) -> exceptions.RentalException:
+        return self.model.conflict_exception(
+            self.model.conflict_message.format(**dict(self.key))
+        )
+
+    def owner(self) -> uuid.UUID | None:
+        row = (
+            consistency.objects(self.model, consistency.Operation.CONFLICT_CHECK)
+            .filter(**dict(self.key))
+            .first()
+        )
+        return None if row is None else row.owner_id
+
+
+def _read_owners(
+    model: typing.Type[cqlm.Model],
+    in_field: str,
+    fixed_key: tuple[tuple[str, typing.Any], ...],
+    values: list[typing.Any],
+) -> list[tuple[typing.Any, uuid.UUID]]:
+    return list(
+        consistency.objects(model, consistency.Operation.CONFLICT_CHECK)
+        .filter(**dict(fixed_key), **{f"{in_field}__in": values})
+        .limit(None)
+        .values_list(in_field, "owner_id")
+    )
+
+
+def owners(
+    claims: typing.Iterable[Claim],
+    chunk_size: int = 100,
+    executor: Executor | None = None,
+) -> dict[Claim, uuid.UUID | None]:
+    found = {}
+    groups = collections.defaultdict(dict)
+    for claim in claims:
+        found[claim] = None
+        key = dict(claim.key)
+        in_field = list(claim.model._partition_keys)[-1]
+        value = claim.model._columns[in_field].to_python(key.pop(in_field))
+        groups[(claim.model, in_field, tuple(sorted(key.items())))][value] = claim
+    reads = [
+        (*group, values_chunk)
+        for group, by_value in groups.items()
+        for values_chunk in chunks(by_value, chunk_size)
+    ]
+    results = (
+        executor.map(_read_owners, *zip(*reads))
+        if executor is not None and reads
+        else itertools.starmap(_read_owners, reads)
+    )
+    for (model, in_field, fixed_key, _), rows in zip(reads, results):
+        by_value = groups[(model, in_field, fixed_key)]
+        for value, owner_id in rows:
+            found[by_value[model._columns[in_field].to_python(value)]] = owner_id
+    return found
+
+
+def booking_days(
+    start_date: datetime.date, end_date: datetime.date
+) -> list[datetime.date]:
+    return [
+        start_date + datetime.timedelta(days=offset)
+        for offset in range((end_date - start_date).days + 1)
+    ]
+
+
+def day_claims(
+    rental_id: uuid.UUID, start_date: datetime.date, end_date: datetime.date
+) -> set[Claim]:
+    return {
+        Claim.make(RentalDayClaim, rental_id=rental_id, day=day)
+        for day in booking_days(start_date, end_date)
+    }
+
+
+def unique_fields_claim(constraint: str, values: list[typing.Any]) -> Claim:
+    return Claim.make(
+        UniqueFieldsClaim,
+        constraint=constraint,
+        value="|".join(str(value) for value in values),
+    )
+
+
+def acquire_claims(claims: typing.Iterable[Claim], owner_id: uuid.UUID) -> None:
+    acquired = []
+    for claim in sorted(claims, key=Claim.sort_key):
+        try:
+            claim.model.if_not_exists().create(**dict(claim.key), owner_id=owner_id)
+        except cql_query.LWTException as e:
+            if e.existing.get("owner_id") == owner_id:
+                continue
+            release_claims(acquired, owner_id)
+            raise claim.conflict()
+        acquired.append(claim)
+
+
+def release_claims(claims: typing.Iterable[Claim], owner_id: uuid.UUID) -> None:
+    for claim in claims:
+        try:
+            claim.model.objects(**dict(claim.key)).iff(owner_id=owner_id).delete()
+        except cql_query.LWTException:
+            continue
+
+
+def write_claims(
+    batch: cql_query.BatchQuery,
+    claims: typing.Iterable[Claim],
+    owner_id: uuid.UUID,
+) -> None:
+    for claim in claims:
+        claim.model.batch(batch).create(**dict(claim.key), owner_id=owner_id)
+
+
+def delete_claims(batch: cql_query.BatchQuery, claims: typing.Iterable[Claim]) -> None:
+    for claim in claims:
+        claim.model.objects.batch(batch).filter(**dict(claim.key)).delete()
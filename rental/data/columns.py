@@ -8,6 +8,8 @@ import cassandra.cqlengine.models as cqlm
 import cassandra.cqlengine.query as cql_query
 
 from .. import exceptions
+from . import consistency
+from .cache import existence_cache
 
 
 class OnDelete(enum.Enum):
@@ -26,8 +28,7 @@ class _Model(typing.Protocol):
         field_name: str,
         ref_model: typing.Type[cqlm.Model],
         on_delete: OnDelete,
-    ) -> None:
-        ...
+    ) -> None: ...
 
 
 class ForeignUUID(cql_columns.UUID):
@@ -42,10 +43,25 @@ class ForeignUUID(cql_columns.UUID):
         self.ref_model = ref_model
         self.on_delete = on_delete
 
+    def to_python(self, value: uuid.UUID) -> uuid.UUID:
+        return super().validate(value)
+
     def validate(self, value: uuid.UUID) -> uuid.UUID:
+        if value is None:
+            return super().validate(value)
+        known_ids = existence_cache(self.ref_model)
+        if value in known_ids:
+            return super().validate(value)
         id_field = self.ref_model.pk.column.column_name
-        if not self.ref_model.objects(**{id_field: value}).count():
+        if (
+            not consistency.objects(
+                self.ref_model, consistency.Operation.EXISTENCE_CHECK
+            )
+            .filter(**{id_field: value})
+            .count()
+        ):
             raise exceptions.NonExistentForeignKeyException(
                 f"Instance of {self.ref_model} with {id_field}={value} does not exist"
             )
+        known_ids.put(value)
         return super().validate(value)
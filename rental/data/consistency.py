@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import enum
+import threading
+import typing
+
+import cassandra.cqlengine.models as cqlm
+import cassandra.cqlengine.query as cql_query
+
+from cassandra import ConsistencyLevel
+
+
+class Operation(enum.Enum):
+    LISTING = "listing"
+    COUNT = "count"
+    LOOKUP = "lookup"
+    EXISTENCE_CHECK = "existence_check"
+    CONFLICT_CHECK = "conflict_check"
+    WRITE = "write"
+    SERIAL = "serial"
+
+
+DEFAULT_POLICY: dict[Operation, int] = {
+    Operation.LISTING: ConsistencyLevel.LOCAL_ONE,
+    Operation.COUNT: ConsistencyLevel.LOCAL_ONE,
+    Operation.LOOKUP: ConsistencyLevel.QUORUM,
+    Operation.EXISTENCE_CHECK: ConsistencyLevel.QUORUM,
+    Operation.CONFLICT_CHECK: ConsistencyLevel.QUORUM,
+    Operation.WRITE: ConsistencyLevel.QUORUM,
+    Operation.SERIAL: ConsistencyLevel.SERIAL,
+}
+
+_policy = dict(DEFAULT_POLICY)
+_policy_lock = threading.Lock()
+
+
+def _to_level(value: int | str) -> int:
+    if isinstance(value, str):
+        try:
+            return ConsistencyLevel.name_to_value[value.strip().upper()]
+        except KeyError:
+            raise ValueError(f"Unknown consistency level: {value}")
+    if value not in ConsistencyLevel.value_to_name:
+        raise ValueError(f"Unknown consistency level: {value}")
+    return value
+
+
+def configure(policy: typing.Mapping[Operation | str, int | str] | None) -> None:
+    levels = {
+        Operation(operation): _to_level(value)
+        for operation, value in (policy or {}).items()
+        if value is not None and value != ""
+    }
+    serial_level = levels.get(Operation.SERIAL)
+    if serial_level is not None and serial_level not in (
+        ConsistencyLevel.SERIAL,
+        ConsistencyLevel.LOCAL_SERIAL,
+    ):
+        raise ValueError("Serial consistency must be SERIAL or LOCAL_SERIAL")
+    with _policy_lock:
+        _policy.update(levels)
+
+
+def reset() -> None:
+    with _policy_lock:
+        _policy.clear()
+        _policy.update(DEFAULT_POLICY)
+
+
+def level(operation: Operation) -> int:
+    return _policy[operation]
+
+
+def objects(
+    model: typing.Type[cqlm.Model], operation: Operation
+) -> cql_query.ModelQuerySet:
+    return model.objects.consistency(level(operation))
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import typing
+
+import cassandra.cqlengine.columns as cql_columns
+import cassandra.cqlengine.connection as cql_conn
+import cassandra.cqlengine.models as cqlm
+
+from cassandra.query import SimpleStatement
+
+from . import consistency
+
+
+class ModelCount(cqlm.Model):
+    __table_name__ = "model_count"
+
+    model_name: str = cql_columns.Text(partition_key=True)
+    count: int = cql_columns.Counter()
+
+
+def increment_statement() -> SimpleStatement:
+    return SimpleStatement(
+        f'UPDATE {ModelCount.column_family_name()} SET "count" = "count" + %s '
+        f'WHERE "model_name" = %s',
+        consistency_level=consistency.level(consistency.Operation.WRITE),
+    )
+
+
+def _increment_name(model_name: str, delta: int) -> None:
+    if delta:
+        cql_conn.get_session().execute(increment_statement(), (delta, model_name))
+
+
+def increment(model: typing.Type[cqlm.Model], delta: int = 1) -> None:
+    _increment_name(model.__name__, delta)
+
+
+def read_counts(models: typing.Iterable[typing.Type[cqlm.Model]]) -> dict[str, int]:
+    names = [model.__name__ for model in models]
+    rows = consistency.objects(ModelCount, consistency.Operation.COUNT).filter(
+        model_name__in=names
+    )
+    counts = {name: 0 for name in names}
+    counts.update({row.model_name: row.count or 0 for row in rows})
+    return counts
+
+
+def set_count(model: typing.Type[cqlm.Model], value: int) -> None:
+    row = (
+        consistency.objects(ModelCount, consistency.Operation.CONFLICT_CHECK)
+        .filter(model_name=model.__name__)
+        .first()
+    )
+    current = 0 if row is None or row.count is None else row.count
+    increment(model, value - current)
+
+
+def reset_all() -> None:
+    for row in consistency.objects(
+        ModelCount, consistency.Operation.CONFLICT_CHECK
+    ).limit(None):
+        _increment_name(row.model_name, -(row.count or 0))
+
+
+def is_counter_model(model: typing.Type[cqlm.Model]) -> bool:
+    return any(
+        isinstance(column, cql_columns.Counter) for column in model._columns.values()
+    )
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import typing
+
+from functools import partial
+
+import cassandra.cqlengine.query as cql_query
+
+from . import claims, models, name_lookup, occupancy, scan, writes
+
+BOOKING_INDEX_COLUMNS = ["id", "rental_id", "start_date", "end_date", "user_id"]
+
+
+def _index_booking(row: dict, batch: cql_query.BatchQuery) -> None:
+    models.RentalBookingByProperty.batch(batch).create(
+        **{name: value for name, value in row.items() if value is not None}
+    )
+
+
+def _booking_index_statements() -> typing.Iterator:
+    for row in scan.scan(models.RentalBooking, columns=BOOKING_INDEX_COLUMNS):
+        yield from writes.collect_mutations(partial(_index_booking, row))
+
+
+def backfill_booking_index() -> None:
+    writes.execute_grouped(
+        _booking_index_statements(), [models.RentalBookingByProperty]
+    )
+    models.occupancy_index.invalidate()
+    models.availability_index.invalidate()
+
+
+def _day_claim_statements() -> typing.Iterator:
+    for row in scan.scan(
+        models.RentalBooking, columns=["id", "rental_id", "start_date", "end_date"]
+    ):
+        held_claims = claims.day_claims(
+            row["rental_id"],
+            occupancy.to_date(row["start_date"]),
+            occupancy.to_date(row["end_date"]),
+        )
+        yield from writes.collect_mutations(
+            partial(claims.write_claims, claims=held_claims, owner_id=row["id"])
+        )
+
+
+def backfill_day_claims() -> None:
+    writes.execute_grouped(_day_claim_statements(), [claims.RentalDayClaim])
+
+
+def _unique_claim_statements(
+    model: typing.Type[models._IdentifieableValidatedModel],
+) -> typing.Iterator:
+    fields = {field for group in model.unique_field_groups for field in group}
+    for row in scan.scan(model, columns=["id", *sorted(fields)]):
+        yield from writes.collect_mutations(
+            partial(
+                claims.write_claims,
+                claims=model.get_unique_claims(row),
+                owner_id=row["id"],
+            )
+        )
+
+
+def backfill_unique_claims() -> None:
+    for model in models.MODELS:
+        if model.unique_field_groups:
+            writes.execute_grouped(
+                _unique_claim_statements(model), [claims.UniqueFieldsClaim]
+            )
+
+
+def backfill_name_lookup() -> None:
+    for model in (models.User, models.RentalProperty):
+        name_lookup.rebuild(model)
+
+
+def rebuild_side_tables() -> None:
+    backfill_booking_index()
+    backfill_day_claims()
+    backfill_unique_claims()
+    backfill_name_lookup()
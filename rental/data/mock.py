@@ -1,54 +1,179 @@
 import json
 import random
+import typing
+import uuid
 
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
-from cassandra.cqlengine.query import BatchQuery
+import cassandra.cqlengine.query as cql_query
 
-from . import models
+from . import counters, models, writes
 from ..util import chunks
 
 CHUNK_SIZE = 100
+WRITE_CONCURRENCY = 64
+READ_CONCURRENCY = 8
+READ_SIZE = 1 << 16
 
+_decoder = json.JSONDecoder()
 
-def load_mock_data(mock_data_dir: Path) -> None:
-    users_data = json.loads((mock_data_dir / "users.json").read_text())
-    created_user_ids = []
-    for user_batch in chunks(users_data, CHUNK_SIZE):
-        with BatchQuery() as batch:
-            for user in user_batch:
-                new_user = models.User.batch(batch).create(**user)
-                created_user_ids.append(new_user.id)
 
-    properties_data = json.loads((mock_data_dir / "properties.json").read_text())
+def _iter_json_array(file: typing.TextIO) -> typing.Iterator[dict]:
+    buffer = ""
+    started = False
+    while True:
+        buffer = buffer.lstrip()
+        if started and buffer.startswith(","):
+            buffer = buffer[1:].lstrip()
+        if buffer:
+            if not started:
+                if buffer[0] != "[":
+                    raise ValueError(f"Expected a JSON array in {file.name}")
+                started = True
+                buffer = buffer[1:]
+                continue
+            if buffer[0] == "]":
+                return
+            try:
+                record, end = _decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                pass
+            else:
+                yield record
+                buffer = buffer[end:]
+                continue
+        chunk = file.read(READ_SIZE)
+        if not chunk:
+            raise ValueError(f"Unexpected end of JSON array in {file.name}")
+        buffer += chunk
+
+
+def _iter_json_lines(file: typing.TextIO) -> typing.Iterator[dict]:
+    for line in file:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def iter_records(path: Path) -> typing.Iterator[dict]:
+    with path.open(encoding="utf-8") as file:
+        if path.suffix == ".jsonl":
+            yield from _iter_json_lines(file)
+        else:
+            yield from _iter_json_array(file)
+
+
+def data_path(mock_data_dir: Path, name: str) -> Path:
+    lines_path = mock_data_dir / f"{name}.jsonl"
+    if lines_path.exists():
+        return lines_path
+    return mock_data_dir / f"{name}.json"
+
+
+def _save_in_batch(
+    instance: models._IdentifieableValidatedModel, batch: cql_query.BatchQuery
+) -> None:
+    try:
+        instance.batch(batch).save()
+    finally:
+        instance._batch = None
+
 
+def _load_chunk(
+    model: typing.Type[models._IdentifieableValidatedModel],
+    rows_chunk: list[dict],
+    concurrency: int,
+    executor: Executor,
+) -> list[models._IdentifieableValidatedModel]:
+    model.validate_foreign_keys_bulk(rows_chunk)
+    instances = [model(**row) for row in rows_chunk]
+    model.validate_bulk(instances, executor)
+    writes.execute_grouped(
+        (
+            statement
+            for instance in instances
+            for statement in writes.collect_mutations(partial(_save_in_batch, instance))
+        ),
+        models.ALL_MODELS,
+        concurrency=concurrency,
+    )
+    for instance in instances:
+        model.after_write(instance._column_values(), None)
+    counters.increment(model, len(instances))
+    return instances
+
+
+def with_references(
+    rows: typing.Iterable[dict],
+    user_ids: list[uuid.UUID],
+    property_ids: list[uuid.UUID],
+) -> typing.Iterator[dict]:
+    users = random.sample(user_ids, k=len(user_ids))
+    properties = random.sample(property_ids, k=len(property_ids))
+    for i, row in enumerate(rows):
+        if "user_id" in row and "rental_id" in row:
+            yield row
+            continue
+        if i >= len(users) or i >= len(properties):
+            raise ValueError("Not enough users or properties to assign references")
+        yield {**row, "user_id": users[i], "rental_id": properties[i]}
+
+
+def load_rows(
+    model: typing.Type[models._IdentifieableValidatedModel],
+    rows: typing.Iterable[dict],
+    concurrency: int,
+    created_ids: list[uuid.UUID] | None = None,
+) -> int:
+    loaded = 0
+    with models.occupancy_index.bulk_load(), ThreadPoolExecutor(
+        max_workers=READ_CONCURRENCY
+    ) as executor:
+        for rows_chunk in chunks(rows, CHUNK_SIZE):
+            instances = _load_chunk(model, rows_chunk, concurrency, executor)
+            loaded += len(instances)
+            if created_ids is not None:
+                created_ids.extend(instance.id for instance in instances)
+    return loaded
+
+
+def load_mock_data(mock_data_dir: Path, concurrency: int = WRITE_CONCURRENCY) -> None:
+    with models.occupancy_index.bulk_load():
+        _load_mock_data(mock_data_dir, concurrency)
+
+
+def _load_mock_data(mock_data_dir: Path, concurrency: int) -> None:
+    created_user_ids = []
     created_property_ids = []
-    for prop_batch in chunks(properties_data, CHUNK_SIZE):
-        with BatchQuery() as batch:
-            for property in prop_batch:
-                new_property = models.RentalProperty.batch(batch).create(**property)
-                created_property_ids.append(new_property.id)
-
-    bookings_data = json.loads((mock_data_dir / "bookings.json").read_text())
-    booking_users = random.sample(created_user_ids, k=len(bookings_data))
-    booking_properties = random.sample(created_property_ids, k=len(bookings_data))
-
-    combined_booking_data = tuple(zip(bookings_data, booking_users, booking_properties))
-    for batch_booking_data in chunks(combined_booking_data, CHUNK_SIZE):
-        with BatchQuery() as batch:
-            for booking, user_id, rental_id in batch_booking_data:
-                models.RentalBooking.batch(batch).create(
-                    **booking, user_id=user_id, rental_id=rental_id
-                )
-
-    reviews_data = json.loads((mock_data_dir / "reviews.json").read_text())
-    review_users = random.sample(created_user_ids, k=len(reviews_data))
-    review_properties = random.sample(created_property_ids, k=len(reviews_data))
-
-    combined_review_data = tuple(zip(reviews_data, review_users, review_properties))
-    for batch_review_data in chunks(combined_review_data, CHUNK_SIZE):
-        with BatchQuery() as batch:
-            for review, user_id, rental_id in batch_review_data:
-                models.RentalReview.batch(batch).create(
-                    **review, user_id=user_id, rental_id=rental_id
-                )
+    load_rows(
+        models.User,
+        iter_records(data_path(mock_data_dir, "users")),
+        concurrency,
+        created_user_ids,
+    )
+    load_rows(
+        models.RentalProperty,
+        iter_records(data_path(mock_data_dir, "properties")),
+        concurrency,
+        created_property_ids,
+    )
+    load_rows(
+        models.RentalBooking,
+        with_references(
+            iter_records(data_path(mock_data_dir, "bookings")),
+            created_user_ids,
+            created_property_ids,
+        ),
+        concurrency,
+    )
+    load_rows(
+        models.RentalReview,
+        with_references(
+            iter_records(data_path(mock_data_dir, "reviews")),
+            created_user_ids,
+            created_property_ids,
+        ),
+        concurrency,
+    )
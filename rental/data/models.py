@@ -1,14 +1,32 @@
 from __future__ import annotations
 
+import collections
 import typing
 import uuid
 import functools
 
+from concurrent.futures import Executor, ThreadPoolExecutor
 import cassandra.cqlengine.models as cqlm
 import cassandra.cqlengine.columns as cql_columns
+import cassandra.cqlengine.query as cql_query
+import cassandra.util as cass_util
 
 from .. import exceptions
-from . import validators, columns
+from ..util import chunks
+from . import (
+    validators,
+    availability,
+    columns,
+    claims,
+    consistency,
+    counters,
+    name_index,
+    name_lookup,
+    occupancy,
+    scan,
+    writes,
+)
+from .cache import existence_cache, row_cache
 
 
 class _IdentifieableValidatedModel(cqlm.Model):
@@ -47,56 +65,358 @@ class _IdentifieableValidatedModel(cqlm.Model):
                     on_delete=column_spec.on_delete,
                 )
 
+    @classmethod
+    def validate_foreign_keys_bulk(
+        cls,
+        rows: typing.Iterable[typing.Mapping | cqlm.Model],
+        chunk_size: int = 100,
+    ) -> None:
+        foreign_columns = {
+            column_name: column
+            for column_name, column in cls._columns.items()
+            if isinstance(column, columns.ForeignUUID)
+        }
+        referenced_ids = collections.defaultdict(set)
+        for row in rows:
+            for column_name, column in foreign_columns.items():
+                value = (
+                    row.get(column_name)
+                    if isinstance(row, typing.Mapping)
+                    else getattr(row, column_name)
+                )
+                if value is None:
+                    continue
+                if not isinstance(value, uuid.UUID):
+                    value = uuid.UUID(str(value))
+                referenced_ids[column.ref_model].add(value)
+
+        for ref_model, ids in referenced_ids.items():
+            known_ids = existence_cache(ref_model)
+            unknown_ids = [ref_id for ref_id in ids if ref_id not in known_ids]
+            id_field = ref_model.pk.column.column_name
+            for ids_chunk in chunks(unknown_ids, chunk_size):
+                found_ids = set(
+                    consistency.objects(
+                        ref_model, consistency.Operation.EXISTENCE_CHECK
+                    )
+                    .filter(**{f"{id_field}__in": ids_chunk})
+                    .limit(None)
+                    .values_list(id_field, flat=True)
+                )
+                for found_id in found_ids:
+                    known_ids.put(found_id)
+                missing_ids = set(ids_chunk) - found_ids
+                if missing_ids:
+                    raise exceptions.NonExistentForeignKeyException(
+                        f"Instances of {ref_model} with {id_field} in "
+                        f"{sorted(map(str, missing_ids))} do not exist"
+                    )
+
+    @classmethod
+    def _get_chunk(cls, ids: list[uuid.UUID]) -> list[_IdentifieableValidatedModel]:
+        return list(
+            consistency.objects(cls, consistency.Operation.LOOKUP)
+            .filter(id__in=ids)
+            .limit(None)
+        )
+
+    @classmethod
+    def get_many(
+        cls,
+        ids: typing.Iterable[uuid.UUID],
+        chunk_size: int = 100,
+        concurrency: int = 8,
+    ) -> dict[uuid.UUID, _IdentifieableValidatedModel]:
+        cache = row_cache(cls)
+        found = {}
+        missing = []
+        for instance_id in dict.fromkeys(ids):
+            instance = cache.get(instance_id)
+            if instance is None:
+                missing.append(instance_id)
+            else:
+                found[instance_id] = instance
+        id_chunks = list(chunks(missing, chunk_size))
+        if not id_chunks:
+            return found
+        with ThreadPoolExecutor(
+            max_workers=min(concurrency, len(id_chunks))
+        ) as executor:
+            for instances in executor.map(cls._get_chunk, id_chunks):
+                for instance in instances:
+                    cache.put(instance.id, instance)
+                    found[instance.id] = instance
+        return found
+
+    _claims_held: bool = False
+    _bulk_validated: bool = False
+
+    def _column_values(self, previous: bool = False) -> dict | None:
+        if not previous:
+            return {name: getattr(self, name) for name in self._columns}
+        if not self._is_persisted:
+            return None
+        return {name: self._values[name].previous_value for name in self._columns}
+
+    @classmethod
+    def get_claims(cls, values: dict | None) -> set[claims.Claim]:
+        return cls.get_unique_claims(values)
+
+    @classmethod
+    def get_unique_claims(cls, values: dict | None) -> set[claims.Claim]:
+        if values is None:
+            return set()
+        unique_claims = set()
+        for field_group in cls.unique_field_groups:
+            group_values = [values[field_name] for field_name in field_group]
+            if any(value is None for value in group_values):
+                continue
+            unique_claims.add(
+                claims.unique_fields_claim(
+                    f"{cls.column_family_name(include_keyspace=False)}"
+                    f"({', '.join(field_group)})",
+                    [
+                        (
+                            value
+                            if isinstance(value, uuid.UUID)
+                            else cls._columns[field_name].to_database(value)
+                        )
+                        for field_name, value in zip(field_group, group_values)
+                    ],
+                )
+            )
+        return unique_claims
+
+    def write_side_tables(
+        self, batch: cql_query.BatchQuery, previous_values: dict | None
+    ) -> None:
+        pass
+
+    def delete_side_tables(self, batch: cql_query.BatchQuery, values: dict) -> None:
+        pass
+
+    @classmethod
+    def after_write(cls, values: dict, previous_values: dict | None) -> None:
+        existence_cache(cls).put(values["id"])
+        row_cache(cls).invalidate(values["id"])
+
+    @classmethod
+    def after_delete(cls, values: dict) -> None:
+        existence_cache(cls).invalidate(values["id"])
+        row_cache(cls).invalidate(values["id"])
+
+    @classmethod
+    def validate_bulk(
+        cls,
+        instances: list[_IdentifieableValidatedModel],
+        executor: Executor | None = None,
+    ) -> None:
+        held_claims = {}
+        for instance in instances:
+            for claim in cls.get_claims(instance._column_values()):
+                if held_claims.setdefault(claim, instance.id) != instance.id:
+                    raise claim.conflict()
+        for claim, owner_id in claims.owners(held_claims, executor=executor).items():
+            if owner_id is not None and owner_id != held_claims[claim]:
+                raise claim.conflict()
+        for instance in instances:
+            instance._bulk_validated = True
+
+    def precheck_conflicts(self) -> None:
+        pass
+
     def validate(self) -> None:
         for validator in self.validators:
             validator(self)
-        for field_group in self.unique_field_groups:
-            relevant_qs = self.objects.filter(
-                **{field_name: getattr(self, field_name) for field_name in field_group}
-            ).allow_filtering()
-            allowable_count = 0
-            if self.objects.filter(id=self.id).count():
-                allowable_count = 1
-            if relevant_qs.count() > allowable_count:
-                raise exceptions.UniqueFieldsRestrictionViolationException(
-                    "An object with the same values for the following fields already exists: "
-                    + ", ".join(field_group)
-                )
+        if self._claims_held or self._bulk_validated:
+            return
+        for claim in self.get_unique_claims(self._column_values()):
+            owner_id = claim.owner()
+            if owner_id is not None and owner_id != self.id:
+                raise claim.conflict()
+
+    def _run_in_batch(self, operation: typing.Callable) -> None:
+        if self._batch is not None:
+            operation(self._batch)
+            return
+        try:
+            with cql_query.BatchQuery() as batch:
+                self.batch(batch)
+                operation(batch)
+        finally:
+            self._batch = None
+
+    def _write(self, operation: typing.Callable) -> _IdentifieableValidatedModel:
+        created = not self._is_persisted
+        previous_values = self._column_values(previous=True)
+        current_values = self._column_values()
+        previous_claims = self.get_claims(previous_values)
+        current_claims = self.get_claims(current_values)
+        new_claims = current_claims - previous_claims
+        stale_claims = previous_claims - current_claims
+
+        def write_with_side_tables(batch: cql_query.BatchQuery) -> None:
+            operation()
+            self.write_side_tables(batch, previous_values)
+
+        if self._batch is not None:
+            write_with_side_tables(self._batch)
+            claims.write_claims(self._batch, new_claims, self.id)
+            claims.delete_claims(self._batch, stale_claims)
+            self._batch.add_callback(
+                type(self).after_write, current_values, previous_values
+            )
+            if created:
+                self._batch.add_callback(counters.increment, type(self), 1)
+            return self
+
+        self.precheck_conflicts()
+        claims.acquire_claims(new_claims, self.id)
+        self._claims_held = True
+        try:
+            self._run_in_batch(write_with_side_tables)
+        except Exception:
+            claims.release_claims(new_claims, self.id)
+            raise
+        finally:
+            self._claims_held = False
+        claims.release_claims(stale_claims, self.id)
+        type(self).after_write(current_values, previous_values)
+        if created:
+            counters.increment(type(self), 1)
+        return self
 
     def save(self):
-        self.validate()
-        return super().save()
+        return self._write(super().save)
+
+    def update(self, **values):
+        for column_name, value in values.items():
+            column = self._columns.get(column_name)
+            if column is not None and not column.is_primary_key:
+                setattr(self, column_name, value)
+        return self._write(functools.partial(super().update, **values))
 
     def resolve_fk_cascade(self):
         if self.reffed_by is None:
             return
+        existence_cache(type(self)).invalidate(self.id)
+        mutations = []
+        hooks = []
+        deleted = collections.Counter()
         for entry in self.reffed_by:
-            ref_qs = entry.ref_model.objects(**{entry.field_name: self.id})
-            if not ref_qs.count():
-                continue
+            ref_qs = consistency.objects(
+                entry.ref_model, consistency.Operation.CONFLICT_CHECK
+            ).filter(**{entry.field_name: self.id})
             if entry.on_delete == columns.OnDelete.CASCADE:
-                for ref in ref_qs:
-                    ref.delete()
-
+                operation = _delete_in_batch
             elif entry.on_delete == columns.OnDelete.SET_NULL:
-                for ref in ref_qs:
-                    ref.update(**{entry.field_name: None})
-
-            elif entry.on_delete == columns.OnDelete.RESTRICT:
-                raise exceptions.ForeignKeyRestrictionViolationException(
-                    f"Instance of {entry.ref_model} with {entry.field_name}={self.id} exists"
+                operation = functools.partial(
+                    _update_in_batch, values={entry.field_name: None}
                 )
-
+            elif entry.on_delete == columns.OnDelete.RESTRICT:
+                if ref_qs.first() is not None:
+                    raise exceptions.ForeignKeyRestrictionViolationException(
+                        f"Instance of {entry.ref_model} with {entry.field_name}={self.id} exists"
+                    )
+                continue
             else:
                 raise ValueError(f"Unknown OnDelete value: {entry.on_delete}")
 
+            for ref in ref_qs.limit(None):
+                ref_values = ref._column_values()
+                mutations.extend(
+                    writes.collect_mutations(functools.partial(operation, ref))
+                )
+                if entry.on_delete == columns.OnDelete.CASCADE:
+                    hooks.append(
+                        functools.partial(entry.ref_model.after_delete, ref_values)
+                    )
+                    deleted[entry.ref_model] += 1
+                else:
+                    hooks.append(
+                        functools.partial(
+                            entry.ref_model.after_write,
+                            ref._column_values(),
+                            ref_values,
+                        )
+                    )
+        writes.execute_grouped(mutations, ALL_MODELS)
+        existence_cache(type(self)).invalidate(self.id)
+        for hook in hooks:
+            hook()
+        for ref_model, count in deleted.items():
+            counters.increment(ref_model, -count)
+
     def delete(self):
         self.resolve_fk_cascade()
-        return super().delete()
+        values = self._column_values(previous=True) or self._column_values()
+        held_claims = self.get_claims(values)
+
+        def delete_with_side_tables(batch: cql_query.BatchQuery) -> None:
+            self.delete_side_tables(batch, values)
+            super(_IdentifieableValidatedModel, self).delete()
+
+        if self._batch is not None:
+            delete_with_side_tables(self._batch)
+            existence_cache(type(self)).invalidate(self.id)
+            claims.delete_claims(self._batch, held_claims)
+            self._batch.add_callback(type(self).after_delete, values)
+            self._batch.add_callback(counters.increment, type(self), -1)
+            return
+        self._run_in_batch(delete_with_side_tables)
+        type(self).after_delete(values)
+        claims.release_claims(held_claims, self.id)
+        counters.increment(type(self), -1)
+
+
+def _delete_in_batch(
+    instance: _IdentifieableValidatedModel, batch: cql_query.BatchQuery
+) -> None:
+    try:
+        instance.batch(batch).delete()
+    finally:
+        instance._batch = None
+
+
+def _update_in_batch(
+    instance: _IdentifieableValidatedModel,
+    batch: cql_query.BatchQuery,
+    values: dict,
+) -> None:
+    try:
+        instance.batch(batch).update(**values)
+    finally:
+        instance._batch = None
+
+
+def _write_name_tables(
+    instance: _IdentifieableValidatedModel,
+    batch: cql_query.BatchQuery,
+    previous_values: dict | None,
+) -> None:
+    if previous_values is not None and previous_values["name"] == instance.name:
+        return
+    if previous_values is not None:
+        name_lookup.delete_entry(
+            batch, type(instance), instance.id, previous_values["name"]
+        )
+    name_lookup.write_entry(batch, type(instance), instance.id, instance.name)
+    name_index.record_change(batch, type(instance), instance.id, instance.name)
+
+
+def _delete_name_tables(
+    instance: _IdentifieableValidatedModel,
+    batch: cql_query.BatchQuery,
+    values: dict,
+) -> None:
+    name_lookup.delete_entry(batch, type(instance), values["id"], values["name"])
+    name_index.record_change(
+        batch, type(instance), values["id"], values["name"], deleted=True
+    )
 
 
 class RentalProperty(_IdentifieableValidatedModel):
-    name: str = cql_columns.Text(required=True, index=True)
+    name: str = cql_columns.Text(required=True)
     description: str = cql_columns.Text()
     address: str = cql_columns.Text(required=True)
     bedrooms: int = cql_columns.Integer(required=True, default=0)
@@ -112,9 +432,83 @@ class RentalProperty(_IdentifieableValidatedModel):
         functools.partial(validators.validate_non_empty, field_name="name"),
     ]
 
+    def write_side_tables(
+        self, batch: cql_query.BatchQuery, previous_values: dict | None
+    ) -> None:
+        _write_name_tables(self, batch, previous_values)
+
+    def delete_side_tables(self, batch: cql_query.BatchQuery, values: dict) -> None:
+        _delete_name_tables(self, batch, values)
+
+    @classmethod
+    def after_write(cls, values: dict, previous_values: dict | None) -> None:
+        super().after_write(values, previous_values)
+        availability_index.put_property(
+            values["id"], values["name"], values["price_per_night"]
+        )
+
+    @classmethod
+    def after_delete(cls, values: dict) -> None:
+        super().after_delete(values)
+        availability_index.remove_property(values["id"])
+
 
 class User(_IdentifieableValidatedModel):
-    name: str = cql_columns.Text(required=True, index=True)
+    name: str = cql_columns.Text(required=True)
+
+    def write_side_tables(
+        self, batch: cql_query.BatchQuery, previous_values: dict | None
+    ) -> None:
+        _write_name_tables(self, batch, previous_values)
+
+    def delete_side_tables(self, batch: cql_query.BatchQuery, values: dict) -> None:
+        _delete_name_tables(self, batch, values)
+
+
+class RentalBookingByProperty(cqlm.Model):
+    __table_name__ = "rental_booking_by_property"
+
+    rental_id: uuid.UUID = cql_columns.UUID(partition_key=True)
+    start_date: str = cql_columns.Date(primary_key=True)
+    id: uuid.UUID = cql_columns.UUID(primary_key=True)
+    end_date: str = cql_columns.Date(required=True)
+    user_id: uuid.UUID = cql_columns.UUID()
+
+
+def _booked_ranges(rental_id: uuid.UUID) -> typing.Iterator[occupancy.Range]:
+    for booking in (
+        consistency.objects(
+            RentalBookingByProperty, consistency.Operation.CONFLICT_CHECK
+        )
+        .filter(rental_id=rental_id)
+        .limit(None)
+    ):
+        yield booking.start_date, booking.end_date
+
+
+def _all_booked_ranges() -> typing.Iterator[tuple[uuid.UUID, occupancy.Range]]:
+    for row in scan.scan(
+        RentalBookingByProperty, columns=["rental_id", "start_date", "end_date"]
+    ):
+        yield row["rental_id"], (row["start_date"], row["end_date"])
+
+
+occupancy_index = occupancy.OccupancyIndex(_booked_ranges, _all_booked_ranges)
+
+
+def _property_directory() -> typing.Iterator[availability.PropertyRow]:
+    for row in scan.scan(RentalProperty, columns=["id", "name", "price_per_night"]):
+        yield row["id"], row["name"], row["price_per_night"]
+
+
+def _all_bookings() -> typing.Iterator[availability.BookingRow]:
+    for row in scan.scan(
+        RentalBookingByProperty, columns=["rental_id", "id", "start_date", "end_date"]
+    ):
+        yield row["rental_id"], row["id"], row["start_date"], row["end_date"]
+
+
+availability_index = availability.AvailabilityIndex(_property_directory, _all_bookings)
 
 
 class RentalBooking(_IdentifieableValidatedModel):
@@ -131,22 +525,52 @@ class RentalBooking(_IdentifieableValidatedModel):
         on_delete=columns.OnDelete.CASCADE,
     )
 
+    def _get_date(self, field_name: str) -> cass_util.Date:
+        return self._columns[field_name].to_python(getattr(self, field_name))
+
+    def _overlaps_existing_booking(self) -> bool:
+        start_date = self._get_date("start_date")
+        overlapping_qs = (
+            consistency.objects(
+                RentalBookingByProperty, consistency.Operation.CONFLICT_CHECK
+            )
+            .filter(
+                rental_id=self.rental_id,
+                start_date__lte=self.end_date,
+            )
+            .limit(None)
+        )
+        return any(
+            booking.end_date >= start_date and booking.id != self.id
+            for booking in overlapping_qs
+        )
+
+    def precheck_conflicts(self) -> None:
+        if any(
+            getattr(self, field_name) is None or getattr(self, field_name) == ""
+            for field_name in ("rental_id", "start_date", "end_date")
+        ):
+            return
+        if (
+            occupancy_index.may_overlap(
+                self.rental_id, self._get_date("start_date"), self._get_date("end_date")
+            )
+            and self._overlaps_existing_booking()
+        ):
+            raise exceptions.OverlappingBookingException(
+                "This booking overlaps with an existing booking"
+            )
+
     def validate_no_overlapping_bookings(self):
-        overlapping_qs = self.objects.filter(
-            rental_id=self.rental_id,
-            start_date__lte=self.end_date,
-            end_date__gte=self.start_date,
-        ).allow_filtering()
-        external_overlapping = [
-            booking for booking in overlapping_qs if booking.id != self.id
-        ]
-        if external_overlapping:
+        if self._claims_held or self._bulk_validated:
+            return
+        if self._overlaps_existing_booking():
             raise exceptions.OverlappingBookingException(
                 "This booking overlaps with an existing booking"
             )
 
     def validate_start_date_before_end_date(self):
-        if self.start_date > self.end_date:
+        if self._get_date("start_date") > self._get_date("end_date"):
             raise exceptions.BadValueException("Start date must be before end date")
 
     validators = [
@@ -158,6 +582,81 @@ class RentalBooking(_IdentifieableValidatedModel):
 
     unique_field_groups = [("rental_id", "user_id")]
 
+    @classmethod
+    def get_claims(cls, values: dict | None) -> set[claims.Claim]:
+        held_claims = super().get_claims(values)
+        if values is None or any(
+            values[field_name] is None or values[field_name] == ""
+            for field_name in ("rental_id", "start_date", "end_date")
+        ):
+            return held_claims
+        try:
+            start_date, end_date = (
+                cls._columns[field_name].to_python(values[field_name]).date()
+                for field_name in ("start_date", "end_date")
+            )
+        except (TypeError, ValueError):
+            return held_claims
+        return held_claims | claims.day_claims(
+            values["rental_id"], start_date, end_date
+        )
+
+    def _property_index_key(self, values: dict) -> dict:
+        return {
+            "rental_id": values["rental_id"],
+            "start_date": self._columns["start_date"].to_database(values["start_date"]),
+            "id": values["id"],
+        }
+
+    @classmethod
+    def after_write(cls, values: dict, previous_values: dict | None) -> None:
+        super().after_write(values, previous_values)
+        if previous_values is not None:
+            availability_index.remove_booking(
+                previous_values["rental_id"], previous_values["id"]
+            )
+            occupancy_index.release(
+                previous_values["rental_id"],
+                previous_values["start_date"],
+                previous_values["end_date"],
+            )
+        occupancy_index.occupy(
+            values["rental_id"], values["start_date"], values["end_date"]
+        )
+        availability_index.add_booking(
+            values["rental_id"], values["id"], values["start_date"], values["end_date"]
+        )
+
+    @classmethod
+    def after_delete(cls, values: dict) -> None:
+        super().after_delete(values)
+        occupancy_index.release(
+            values["rental_id"], values["start_date"], values["end_date"]
+        )
+        availability_index.remove_booking(values["rental_id"], values["id"])
+
+    def write_side_tables(
+        self, batch: cql_query.BatchQuery, previous_values: dict | None
+    ) -> None:
+        if previous_values is not None and self._property_index_key(
+            previous_values
+        ) != self._property_index_key(self._column_values()):
+            self.delete_side_tables(batch, previous_values)
+        RentalBookingByProperty(
+            rental_id=self.rental_id,
+            start_date=self.start_date,
+            id=self.id,
+            end_date=self.end_date,
+            user_id=self.user_id,
+        ).batch(batch).save()
+
+    def delete_side_tables(self, batch: cql_query.BatchQuery, values: dict) -> None:
+        RentalBookingByProperty.objects.batch(batch).filter(
+            rental_id=values["rental_id"],
+            start_date=values["start_date"],
+            id=values["id"],
+        ).delete()
+
 
 class RentalReview(_IdentifieableValidatedModel):
     rating: int = cql_columns.Integer(required=True)
@@ -179,5 +678,13 @@ class RentalReview(_IdentifieableValidatedModel):
 
 
 MODELS = [cls for cls in _IdentifieableValidatedModel.__subclasses__()]
+AUXILIARY_MODELS = [
+    RentalBookingByProperty,
+    *claims.CLAIM_MODELS,
+    counters.ModelCount,
+    name_index.NameChange,
+    name_lookup.NameLookup,
+]
+ALL_MODELS = MODELS + AUXILIARY_MODELS
 for model in MODELS:
     model.register_internal_foreign_keys()
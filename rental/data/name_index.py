@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import bisect
+import datetime
+import threading
+import typing
+import uuid
+
+import cassandra.cqlengine.columns as cql_columns
+import cassandra.cqlengine.models as cqlm
+import cassandra.cqlengine.query as cql_query
+import cassandra.util as cass_util
+
+from . import consistency, scan
+
+CHANGE_TTL = datetime.timedelta(days=7)
+BUCKET_SIZE = datetime.timedelta(hours=1)
+CLOCK_SKEW_MARGIN = datetime.timedelta(seconds=5)
+CHANGE_SHARDS = 8
+DEFAULT_LIMIT = 20
+
+
+class NameChange(cqlm.Model):
+    __table_name__ = "name_change"
+    __options__ = {"default_time_to_live": int(CHANGE_TTL.total_seconds())}
+
+    model_name: str = cql_columns.Text(partition_key=True)
+    bucket: int = cql_columns.BigInt(partition_key=True)
+    shard: int = cql_columns.Integer(partition_key=True)
+    changed_at: uuid.UUID = cql_columns.TimeUUID(primary_key=True)
+    entity_id: uuid.UUID = cql_columns.UUID(primary_key=True)
+    name: str = cql_columns.Text()
+    deleted: bool = cql_columns.Boolean(default=False)
+
+
+def _bucket(moment: datetime.datetime) -> int:
+    return int(moment.timestamp() // BUCKET_SIZE.total_seconds())
+
+
+def record_change(
+    batch: cql_query.BatchQuery,
+    model: typing.Type[cqlm.Model],
+    entity_id: uuid.UUID,
+    name: str | None,
+    deleted: bool = False,
+) -> None:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    NameChange.batch(batch).create(
+        model_name=model.__name__,
+        bucket=_bucket(now),
+        shard=entity_id.int % CHANGE_SHARDS,
+        changed_at=cass_util.uuid_from_time(now),
+        entity_id=entity_id,
+        name=name,
+        deleted=deleted,
+    )
+
+
+class PrefixIndex:
+    def __init__(self) -> None:
+        self._entries: list[tuple[str, str, uuid.UUID]] = []
+        self._names: dict[uuid.UUID, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _remove(self, entity_id: uuid.UUID) -> None:
+        name = self._names.pop(entity_id, None)
+        if name is None:
+            return
+        entry = (name.casefold(), name, entity_id)
+        position = bisect.bisect_left(self._entries, entry)
+        if position < len(self._entries) and self._entries[position] == entry:
+            del self._entries[position]
+
+    def put(self, entity_id: uuid.UUID, name: str) -> None:
+        with self._lock:
+            self._remove(entity_id)
+            self._names[entity_id] = name
+            bisect.insort(self._entries, (name.casefold(), name, entity_id))
+
+    def remove(self, entity_id: uuid.UUID) -> None:
+        with self._lock:
+            self._remove(entity_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._names.clear()
+
+    def search(self, prefix: str, limit: int = DEFAULT_LIMIT) -> list[str]:
+        key = prefix.casefold()
+        matches = []
+        with self._lock:
+            position = bisect.bisect_left(self._entries, (key,))
+            while position < len(self._entries) and len(matches) < limit:
+                entry_key, name, _ = self._entries[position]
+                if not entry_key.startswith(key):
+                    break
+                if not matches or matches[-1] != name:
+                    matches.append(name)
+                position += 1
+        return matches
+
+
+class NameIndex:
+    def __init__(self, model: typing.Type[cqlm.Model]) -> None:
+        self.model = model
+        self.index = PrefixIndex()
+        self.refreshed_at: datetime.datetime | None = None
+
+    def search(self, prefix: str, limit: int = DEFAULT_LIMIT) -> list[str]:
+        return self.index.search(prefix, limit)
+
+    def _rebuild(self) -> None:
+        self.index.clear()
+        for row in scan.scan(self.model, columns=["id", "name"]):
+            self.index.put(row["id"], row["name"])
+
+    def _changes(
+        self, since: datetime.datetime, until: datetime.datetime
+    ) -> list[NameChange]:
+        changes = []
+        for bucket in range(_bucket(since), _bucket(until) + 1):
+            changes.extend(
+                consistency.objects(NameChange, consistency.Operation.LISTING)
+                .filter(
+                    model_name=self.model.__name__,
+                    bucket=bucket,
+                    shard__in=list(range(CHANGE_SHARDS)),
+                    changed_at__gt=cass_util.min_uuid_from_time(since.timestamp()),
+                )
+                .limit(None)
+            )
+        changes.sort(
+            key=lambda change: cass_util.unix_time_from_uuid1(change.changed_at)
+        )
+        return changes
+
+    def _apply_changes(
+        self, since: datetime.datetime, until: datetime.datetime
+    ) -> None:
+        for change in self._changes(since, until):
+            if change.deleted:
+                self.index.remove(change.entity_id)
+            else:
+                self.index.put(change.entity_id, change.name)
+
+    def invalidate(self) -> None:
+        self.refreshed_at = None
+
+    def refresh(self) -> None:
+        now = datetime.datetime.now(datetime.timezone.utc)
+        if self.refreshed_at is None or now - self.refreshed_at > CHANGE_TTL:
+            self._rebuild()
+        else:
+            self._apply_changes(self.refreshed_at - CLOCK_SKEW_MARGIN, now)
+        self.refreshed_at = now
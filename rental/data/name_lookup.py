@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import typing
+import uuid
+
+from functools import partial
+
+import cassandra.cqlengine.columns as cql_columns
+import cassandra.cqlengine.models as cqlm
+import cassandra.cqlengine.query as cql_query
+
+from . import consistency, scan, writes
+from .cache import name_cache
+
+
+class NameLookup(cqlm.Model):
+    __table_name__ = "name_lookup"
+
+    model_name: str = cql_columns.Text(partition_key=True)
+    name: str = cql_columns.Text(partition_key=True)
+    entity_id: uuid.UUID = cql_columns.UUID(primary_key=True)
+
+
+def write_entry(
+    batch: cql_query.BatchQuery,
+    model: typing.Type[cqlm.Model],
+    entity_id: uuid.UUID,
+    name: str,
+) -> None:
+    NameLookup.batch(batch).create(
+        model_name=model.__name__, name=name, entity_id=entity_id
+    )
+    batch.add_callback(name_cache(model).invalidate, name)
+
+
+def delete_entry(
+    batch: cql_query.BatchQuery,
+    model: typing.Type[cqlm.Model],
+    entity_id: uuid.UUID,
+    name: str,
+) -> None:
+    NameLookup.objects.batch(batch).filter(
+        model_name=model.__name__, name=name, entity_id=entity_id
+    ).delete()
+    batch.add_callback(name_cache(model).invalidate, name)
+
+
+def resolve(model: typing.Type[cqlm.Model], name: str) -> uuid.UUID | None:
+    cache = name_cache(model)
+    entity_id = cache.get(name)
+    if entity_id is not None:
+        return entity_id
+    entry = (
+        consistency.objects(NameLookup, consistency.Operation.LOOKUP)
+        .filter(model_name=model.__name__, name=name)
+        .first()
+    )
+    if entry is None:
+        return None
+    cache.put(name, entry.entity_id)
+    return entry.entity_id
+
+
+def get_id(model: typing.Type[cqlm.Model], name: str) -> uuid.UUID:
+    entity_id = resolve(model, name)
+    if entity_id is None:
+        raise model.DoesNotExist(f"No {model.__name__} named {name!r}")
+    return entity_id
+
+
+def _create_in_batch(
+    model: typing.Type[cqlm.Model],
+    row: dict,
+    batch: cql_query.BatchQuery,
+) -> None:
+    NameLookup.batch(batch).create(
+        model_name=model.__name__, name=row["name"], entity_id=row["id"]
+    )
+
+
+def _rebuild_statements(model: typing.Type[cqlm.Model]) -> typing.Iterator:
+    for row in scan.scan(model, columns=["id", "name"]):
+        yield from writes.collect_mutations(partial(_create_in_batch, model, row))
+
+
+def rebuild(model: typing.Type[cqlm.Model]) -> None:
+    writes.execute_grouped(_rebuild_statements(model), [NameLookup])
+    name_cache(model).clear()
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import contextlib
+import datetime
+import threading
+import time
+import typing
+import uuid
+
+import numpy as np
+
+DAYS_PER_YEAR = 366
+BYTES_PER_YEAR = (DAYS_PER_YEAR + 7) // 8
+LOAD_TTL = 60.0
+
+Range = tuple[typing.Any, typing.Any]
+
+
+def to_date(value: typing.Any) -> datetime.date:
+    if isinstance(value, str):
+        return datetime.date.fromisoformat(value)
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return value.date()
+
+
+def _year_spans(
+    start: datetime.date, end: datetime.date
+) -> typing.Iterator[tuple[int, int, int]]:
+    for year in range(start.year, end.year + 1):
+        first = start if start.year == year else datetime.date(year, 1, 1)
+        last = end if end.year == year else datetime.date(year, 12, 31)
+        yield year, first.timetuple().tm_yday - 1, last.timetuple().tm_yday
+
+
+def _range_mask(first: int, stop: int) -> np.ndarray:
+    days = np.zeros(DAYS_PER_YEAR, dtype=bool)
+    days[first:stop] = True
+    return np.packbits(days)
+
+
+class _YearBitmap:
+    def __init__(self) -> None:
+        self.rows: dict[uuid.UUID, int] = {}
+        self.bits = np.zeros((16, BYTES_PER_YEAR), dtype=np.uint8)
+
+    def row(self, property_id: uuid.UUID) -> int:
+        row = self.rows.get(property_id)
+        if row is None:
+            row = self.rows[property_id] = len(self.rows)
+            if row == len(self.bits):
+                self.bits = np.concatenate([self.bits, np.zeros_like(self.bits)])
+        return row
+
+    def set_range(self, property_id: uuid.UUID, first: int, stop: int, value: bool):
+        row = self.row(property_id)
+        days = np.unpackbits(self.bits[row], count=DAYS_PER_YEAR).astype(bool)
+        days[first:stop] = value
+        self.bits[row] = np.packbits(days)
+
+    def overlaps(self, property_id: uuid.UUID, first: int, stop: int) -> bool:
+        row = self.rows.get(property_id)
+        return row is not None and bool(
+            np.any(self.bits[row] & _range_mask(first, stop))
+        )
+
+    def clear(self, property_id: uuid.UUID) -> None:
+        row = self.rows.get(property_id)
+        if row is not None:
+            self.bits[row] = 0
+
+    def occupied_days(self, first: int, stop: int) -> dict[uuid.UUID, int]:
+        days = np.unpackbits(self.bits[: len(self.rows)], axis=1, count=DAYS_PER_YEAR)
+        counts = days[:, first:stop].sum(axis=1)
+        return {property_id: int(counts[row]) for property_id, row in self.rows.items()}
+
+
+def _mark(
+    years: dict[int, _YearBitmap],
+    property_id: uuid.UUID,
+    start: typing.Any,
+    end: typing.Any,
+    value: bool,
+) -> None:
+    for year, first, stop in _year_spans(to_date(start), to_date(end)):
+        if year not in years:
+            years[year] = _YearBitmap()
+        years[year].set_range(property_id, first, stop, value)
+
+
+class OccupancyIndex:
+    def __init__(
+        self,
+        load_property: typing.Callable[[uuid.UUID], typing.Iterable[Range]],
+        load_all: typing.Callable[[], typing.Iterable[tuple[uuid.UUID, Range]]],
+        ttl: float = LOAD_TTL,
+    ) -> None:
+        self.load_property = load_property
+        self.load_all = load_all
+        self.ttl = ttl
+        self.years: dict[int, _YearBitmap] = {}
+        self.loaded: dict[uuid.UUID, float] = {}
+        self.all_loaded_at: float | None = None
+        self._generation = 0
+        self._bulk_loads = 0
+        self._lock = threading.RLock()
+
+    def _is_fresh(self, loaded_at: float | None) -> bool:
+        return loaded_at is not None and time.monotonic() - loaded_at <= self.ttl
+
+    def _is_fresh_for(self, property_id: uuid.UUID) -> bool:
+        return self._is_fresh(self.loaded.get(property_id)) or self._is_fresh(
+            self.all_loaded_at
+        )
+
+    def _overlaps(
+        self, property_id: uuid.UUID, start: datetime.date, end: datetime.date
+    ) -> bool:
+        return any(
+            self.years[year].overlaps(property_id, first, stop)
+            for year, first, stop in _year_spans(start, end)
+            if year in self.years
+        )
+
+    def _load(
+        self, property_id: uuid.UUID
+    ) -> list[tuple[datetime.date, datetime.date]]:
+        with self._lock:
+            generation = self._generation
+        ranges = [
+            (to_date(start), to_date(end))
+            for start, end in self.load_property(property_id)
+        ]
+        with self._lock:
+            if generation == self._generation:
+                for bitmap in self.years.values():
+                    bitmap.clear(property_id)
+                for start, end in ranges:
+                    _mark(self.years, property_id, start, end, True)
+                self.loaded[property_id] = time.monotonic()
+        return ranges
+
+    def _load_all(self) -> dict[int, _YearBitmap]:
+        with self._lock:
+            generation = self._generation
+        years: dict[int, _YearBitmap] = {}
+        loaded = set()
+        for property_id, (start, end) in self.load_all():
+            _mark(years, property_id, start, end, True)
+            loaded.add(property_id)
+        loaded_at = time.monotonic()
+        with self._lock:
+            if generation == self._generation:
+                self.years = years
+                self.loaded = dict.fromkeys(loaded, loaded_at)
+                self.all_loaded_at = loaded_at
+        return years
+
+    def _is_tracked(self, property_id: uuid.UUID) -> bool:
+        return property_id in self.loaded or self.all_loaded_at is not None
+
+    def occupy(self, property_id: uuid.UUID, start, end) -> None:
+        with self._lock:
+            if self._is_tracked(property_id):
+                _mark(self.years, property_id, start, end, True)
+
+    def release(self, property_id: uuid.UUID, start, end) -> None:
+        with self._lock:
+            if self._is_tracked(property_id):
+                _mark(self.years, property_id, start, end, False)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self.years = {}
+            self.loaded = {}
+            self.all_loaded_at = None
+
+    @contextlib.contextmanager
+    def bulk_load(self) -> typing.Iterator[None]:
+        with self._lock:
+            self._bulk_loads += 1
+            self.invalidate()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._bulk_loads -= 1
+                self.invalidate()
+
+    def is_known_free(self, property_id: uuid.UUID, start, end) -> bool:
+        start, end = to_date(start), to_date(end)
+        with self._lock:
+            return (
+                not self._bulk_loads
+                and self._is_fresh_for(property_id)
+                and not self._overlaps(property_id, start, end)
+            )
+
+    def may_overlap(self, property_id: uuid.UUID, start, end) -> bool:
+        start, end = to_date(start), to_date(end)
+        with self._lock:
+            if self._bulk_loads:
+                return True
+            fresh = self._is_fresh_for(property_id)
+        if not fresh:
+            ranges = self._load(property_id)
+            with self._lock:
+                if property_id not in self.loaded:
+                    return any(
+                        booked_start <= end and booked_end >= start
+                        for booked_start, booked_end in ranges
+                    )
+        with self._lock:
+            return self._overlaps(property_id, start, end)
+
+    def occupied_days(self, start, end) -> dict[uuid.UUID, int]:
+        with self._lock:
+            years = self.years if self._is_fresh(self.all_loaded_at) else None
+        if years is None:
+            years = self._load_all()
+        occupied: dict[uuid.UUID, int] = {}
+        with self._lock:
+            for year, first, stop in _year_spans(to_date(start), to_date(end)):
+                if year not in years:
+                    continue
+                for property_id, days in years[year].occupied_days(first, stop).items():
+                    occupied[property_id] = occupied.get(property_id, 0) + days
+        return occupied
+
+    def month_occupancy(self, year: int, month: int) -> dict[uuid.UUID, int]:
+        start = datetime.date(year, month, 1)
+        end = (start + datetime.timedelta(days=31)).replace(day=1)
+        return self.occupied_days(start, end - datetime.timedelta(days=1))
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import typing
+
+import cassandra.cqlengine.connection as cql_conn
+import cassandra.cqlengine.models as cqlm
+
+from cassandra.query import SimpleStatement
+
+from . import consistency
+
+DEFAULT_PAGE_SIZE = 200
+
+
+class Page(typing.NamedTuple):
+    rows: list[dict]
+    paging_state: bytes | None
+
+
+class PagedQuery:
+    def __init__(
+        self,
+        model: typing.Type[cqlm.Model],
+        columns: typing.Iterable[str],
+        where: typing.Mapping[str, typing.Any],
+        allow_filtering: bool = False,
+        operation: consistency.Operation = consistency.Operation.LISTING,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> None:
+        self.fields = {model._columns[name].db_field_name: name for name in columns}
+        conditions = " AND ".join(
+            f'"{model._columns[name].db_field_name}" = %s' for name in where
+        )
+        select = ", ".join(f'"{field}"' for field in self.fields)
+        self.values = list(where.values())
+        self.statement = SimpleStatement(
+            f"SELECT {select} FROM {model.column_family_name()}"
+            + (f" WHERE {conditions}" if conditions else "")
+            + (" ALLOW FILTERING" if allow_filtering else ""),
+            fetch_size=page_size,
+            consistency_level=consistency.level(operation),
+        )
+
+    def fetch(self, paging_state: bytes | None = None) -> Page:
+        result = cql_conn.get_session().execute(
+            self.statement, self.values, paging_state=paging_state
+        )
+        rows = [
+            {self.fields[field]: value for field, value in row.items()}
+            for row in result.current_rows
+        ]
+        return Page(rows=rows, paging_state=result.paging_state)
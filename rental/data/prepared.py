@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import threading
+import typing
+
+import cassandra.cqlengine.connection as cql_conn
+import cassandra.cqlengine.models as cqlm
+
+from cassandra.query import UNSET_VALUE, BoundStatement, PreparedStatement
+
+from . import claims, consistency, models
+
+
+class StatementSpec(typing.NamedTuple):
+    model: typing.Type[cqlm.Model]
+    operation: str
+    build: typing.Callable[[typing.Type[cqlm.Model]], str]
+    params: typing.Callable[[typing.Type[cqlm.Model]], list[str]]
+    idempotent: bool = False
+
+
+def _quoted(names: typing.Iterable[str]) -> str:
+    return ", ".join(f'"{name}"' for name in names)
+
+
+def _conditions(names: typing.Iterable[str]) -> str:
+    return " AND ".join(f'"{name}" = ?' for name in names)
+
+
+def _column_names(model: typing.Type[cqlm.Model]) -> list[str]:
+    return list(model._columns)
+
+
+def _primary_key_names(model: typing.Type[cqlm.Model]) -> list[str]:
+    return list(model._primary_keys)
+
+
+def _claim_key_names(model: typing.Type[cqlm.Model]) -> list[str]:
+    return sorted(model._partition_keys)
+
+
+def _insert_cql(model: typing.Type[cqlm.Model]) -> str:
+    names = _column_names(model)
+    return (
+        f"INSERT INTO {model.column_family_name()} ({_quoted(names)}) "
+        f"VALUES ({', '.join('?' * len(names))})"
+    )
+
+
+def _delete_cql(model: typing.Type[cqlm.Model]) -> str:
+    return (
+        f"DELETE FROM {model.column_family_name()} "
+        f"WHERE {_conditions(_primary_key_names(model))}"
+    )
+
+
+def _get_cql(model: typing.Type[cqlm.Model]) -> str:
+    return f"SELECT * FROM {model.column_family_name()} WHERE id = ?"
+
+
+def _exists_cql(model: typing.Type[cqlm.Model]) -> str:
+    return f"SELECT id FROM {model.column_family_name()} WHERE id = ?"
+
+
+def _claim_insert_cql(model: typing.Type[cqlm.Model]) -> str:
+    names = [*_claim_key_names(model), "owner_id"]
+    return (
+        f"INSERT INTO {model.column_family_name()} ({_quoted(names)}) "
+        f"VALUES ({', '.join('?' * len(names))}) IF NOT EXISTS"
+    )
+
+
+def _claim_release_cql(model: typing.Type[cqlm.Model]) -> str:
+    return (
+        f"DELETE FROM {model.column_family_name()} "
+        f'WHERE {_conditions(_claim_key_names(model))} IF "owner_id" = ?'
+    )
+
+
+def _overlap_cql(model: typing.Type[cqlm.Model]) -> str:
+    return (
+        f"SELECT id, end_date FROM {model.column_family_name()} "
+        f"WHERE rental_id = ? AND start_date <= ?"
+    )
+
+
+def _id_param(model: typing.Type[cqlm.Model]) -> list[str]:
+    return ["id"]
+
+
+def _overlap_params(model: typing.Type[cqlm.Model]) -> list[str]:
+    return ["rental_id", "end_date"]
+
+
+def _claim_params(model: typing.Type[cqlm.Model]) -> list[str]:
+    return [*_claim_key_names(model), "owner_id"]
+
+
+STATEMENT_SPECS = [
+    *(
+        StatementSpec(model, "exists", _exists_cql, _id_param, idempotent=True)
+        for model in (models.User, models.RentalProperty)
+    ),
+    *(
+        spec
+        for model in (models.RentalBooking, models.RentalReview)
+        for spec in (
+            StatementSpec(model, "get", _get_cql, _id_param, idempotent=True),
+            StatementSpec(model, "insert", _insert_cql, _column_names),
+            StatementSpec(model, "delete", _delete_cql, _primary_key_names),
+        )
+    ),
+    StatementSpec(models.RentalBookingByProperty, "insert", _insert_cql, _column_names),
+    StatementSpec(
+        models.RentalBookingByProperty, "delete", _delete_cql, _primary_key_names
+    ),
+    StatementSpec(
+        models.RentalBookingByProperty,
+        "overlap",
+        _overlap_cql,
+        _overlap_params,
+        idempotent=True,
+    ),
+    *(
+        spec
+        for model in claims.CLAIM_MODELS
+        for spec in (
+            StatementSpec(model, "acquire", _claim_insert_cql, _claim_params),
+            StatementSpec(model, "release", _claim_release_cql, _claim_params),
+        )
+    ),
+]
+
+OPERATION_CONSISTENCY = {
+    "exists": consistency.Operation.EXISTENCE_CHECK,
+    "get": consistency.Operation.LOOKUP,
+    "overlap": consistency.Operation.CONFLICT_CHECK,
+}
+CONDITIONAL_OPERATIONS = {"acquire", "release"}
+
+_specs = {(spec.model, spec.operation): spec for spec in STATEMENT_SPECS}
+_prepared: dict[tuple[typing.Type[cqlm.Model], str], PreparedStatement] = {}
+_prepared_lock = threading.Lock()
+
+
+def prepare_statements() -> None:
+    for model, operation in _specs:
+        get_prepared(model, operation)
+
+
+def is_prepared() -> bool:
+    return len(_prepared) == len(_specs)
+
+
+def reset() -> None:
+    with _prepared_lock:
+        _prepared.clear()
+
+
+def get_prepared(model: typing.Type[cqlm.Model], operation: str) -> PreparedStatement:
+    key = (model, operation)
+    prepared = _prepared.get(key)
+    if prepared is not None:
+        return prepared
+    spec = _specs[key]
+    prepared = cql_conn.get_session().prepare(spec.build(model))
+    prepared.is_idempotent = spec.idempotent
+    with _prepared_lock:
+        _prepared[key] = prepared
+    return prepared
+
+
+def bind(
+    model: typing.Type[cqlm.Model], operation: str, values: typing.Mapping
+) -> BoundStatement:
+    spec = _specs[(model, operation)]
+    bound = get_prepared(model, operation).bind(
+        [
+            UNSET_VALUE if values.get(name) is None else values[name]
+            for name in spec.params(model)
+        ]
+    )
+    bound.consistency_level = consistency.level(
+        OPERATION_CONSISTENCY.get(operation, consistency.Operation.WRITE)
+    )
+    if operation in CONDITIONAL_OPERATIONS:
+        bound.serial_consistency_level = consistency.level(consistency.Operation.SERIAL)
+    return bound
@@ -2,7 +2,7 @@ from uuid import UUID
 
 from cassandra.cqlengine.models import _DoesNotExist
 
-from . import models
+from . import async_requests, consistency, models, prepared
 
 
 def make_reservation(
@@ -12,6 +12,12 @@ def make_reservation(
     end_date: str,
     ignore_errors: bool = True,
 ) -> UUID | None:
+    if prepared.is_prepared():
+        return async_requests.run(
+            async_requests.make_reservation_async(
+                user_id, property_id, start_date, end_date, ignore_errors
+            )
+        )
     booking = models.RentalBooking(
         user_id=user_id,
         rental_id=property_id,
@@ -37,6 +43,12 @@ def add_review(
     comment: str,
     ignore_errors: bool = True,
 ) -> UUID:
+    if prepared.is_prepared():
+        return async_requests.run(
+            async_requests.add_review_async(
+                user_id, property_id, rating, comment, ignore_errors
+            )
+        )
     review = models.RentalReview(
         user_id=user_id,
         rental_id=property_id,
@@ -56,8 +68,12 @@ def add_review(
 
 
 def cancel_booking(booking_id: UUID) -> bool:
+    if prepared.is_prepared():
+        return async_requests.run(async_requests.cancel_booking_async(booking_id))
     try:
-        booking = models.RentalBooking.objects.get(id=booking_id)
+        booking = consistency.objects(
+            models.RentalBooking, consistency.Operation.LOOKUP
+        ).get(id=booking_id)
     except _DoesNotExist:
         return False
     booking.delete()
@@ -65,8 +81,12 @@ def cancel_booking(booking_id: UUID) -> bool:
 
 
 def withdraw_review(review_id: UUID) -> bool:
+    if prepared.is_prepared():
+        return async_requests.run(async_requests.withdraw_review_async(review_id))
     try:
-        review = models.RentalReview.objects.get(id=review_id)
+        review = consistency.objects(
+            models.RentalReview, consistency.Operation.LOOKUP
+        ).get(id=review_id)
     except _DoesNotExist:
         return False
     review.delete()
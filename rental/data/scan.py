@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import collections
+import typing
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+
+import cassandra.cqlengine.connection as cql_conn
+import cassandra.cqlengine.models as cqlm
+
+from cassandra.query import SimpleStatement
+
+from . import consistency
+
+MIN_TOKEN = -(2**63)
+MAX_TOKEN = 2**63 - 1
+DEFAULT_SPLITS = 64
+DEFAULT_CONCURRENCY = 8
+DEFAULT_FETCH_SIZE = 5_000
+
+T = typing.TypeVar("T")
+
+
+class TokenRange(typing.NamedTuple):
+    start: int
+    end: int
+    last: bool
+
+    def condition(self, partition_key: str) -> str:
+        upper = "<=" if self.last else "<"
+        return (
+            f"token({partition_key}) >= {self.start} "
+            f"AND token({partition_key}) {upper} {self.end}"
+        )
+
+
+def split_token_ring(splits: int = DEFAULT_SPLITS) -> list[TokenRange]:
+    if splits < 1:
+        raise ValueError("splits must be positive")
+    step = (MAX_TOKEN - MIN_TOKEN) // splits
+    bounds = [MIN_TOKEN + step * i for i in range(splits)] + [MAX_TOKEN]
+    return [
+        TokenRange(start=start, end=end, last=i == splits - 1)
+        for i, (start, end) in enumerate(zip(bounds, bounds[1:]))
+    ]
+
+
+def _db_fields(model: typing.Type[cqlm.Model], names: typing.Iterable[str]) -> dict:
+    return {model._columns[name].db_field_name: name for name in names}
+
+
+def _partition_key(model: typing.Type[cqlm.Model]) -> str:
+    return ", ".join(
+        f'"{column.db_field_name}"' for column in model._partition_keys.values()
+    )
+
+
+def _execute_range(
+    model: typing.Type[cqlm.Model],
+    select: str,
+    token_range: TokenRange,
+    operation: consistency.Operation,
+    fetch_size: int,
+) -> typing.Iterable[dict]:
+    statement = SimpleStatement(
+        f"SELECT {select} FROM {model.column_family_name()} "
+        f"WHERE {token_range.condition(_partition_key(model))}",
+        fetch_size=fetch_size,
+        consistency_level=consistency.level(operation),
+    )
+    return cql_conn.get_session().execute(statement)
+
+
+def scan_range(
+    model: typing.Type[cqlm.Model],
+    token_range: TokenRange,
+    columns: typing.Iterable[str] | None = None,
+    operation: consistency.Operation = consistency.Operation.LISTING,
+    fetch_size: int = DEFAULT_FETCH_SIZE,
+) -> list[dict]:
+    fields = _db_fields(model, columns or model._columns)
+    select = ", ".join(f'"{field}"' for field in fields)
+    return [
+        {fields[field]: value for field, value in row.items()}
+        for row in _execute_range(model, select, token_range, operation, fetch_size)
+    ]
+
+
+def count_range(
+    model: typing.Type[cqlm.Model],
+    token_range: TokenRange,
+    operation: consistency.Operation = consistency.Operation.COUNT,
+) -> int:
+    rows = _execute_range(model, "COUNT(*)", token_range, operation, DEFAULT_FETCH_SIZE)
+    return sum(row["count"] for row in rows)
+
+
+def map_token_ranges(
+    function: typing.Callable[[TokenRange], T],
+    splits: int = DEFAULT_SPLITS,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> typing.Iterator[T]:
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending: collections.deque[Future] = collections.deque()
+        for token_range in split_token_ring(splits):
+            if len(pending) >= concurrency:
+                yield pending.popleft().result()
+            pending.append(executor.submit(function, token_range))
+        while pending:
+            yield pending.popleft().result()
+
+
+def scan(
+    model: typing.Type[cqlm.Model],
+    columns: typing.Iterable[str] | None = None,
+    operation: consistency.Operation = consistency.Operation.LISTING,
+    splits: int = DEFAULT_SPLITS,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    fetch_size: int = DEFAULT_FETCH_SIZE,
+) -> typing.Iterator[dict]:
+    scan_function = partial(
+        scan_range,
+        model,
+        columns=list(columns) if columns is not None else None,
+        operation=operation,
+        fetch_size=fetch_size,
+    )
+    for rows in map_token_ranges(scan_function, splits, concurrency):
+        yield from rows
+
+
+def scan_primary_keys(
+    model: typing.Type[cqlm.Model], **kwargs
+) -> typing.Iterator[dict]:
+    return scan(model, columns=model._primary_keys, **kwargs)
+
+
+def count(
+    model: typing.Type[cqlm.Model],
+    operation: consistency.Operation = consistency.Operation.COUNT,
+    splits: int = DEFAULT_SPLITS,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> int:
+    return sum(
+        map_token_ranges(
+            partial(count_range, model, operation=operation), splits, concurrency
+        )
+    )
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import array
+import json
+import mmap
+import shutil
+import struct
+import sys
+import tempfile
+import typing
+
+from pathlib import Path
+
+import cassandra.cqlengine.connection as cql_conn
+import cassandra.cqlengine.models as cqlm
+
+from cassandra.concurrent import execute_concurrent_with_args
+
+from . import consistency, scan
+
+MAGIC = b"RNTSNAP1"
+FILE_SUFFIX = ".snap"
+PROTOCOL_VERSION = 4
+RESTORE_CONCURRENCY = 128
+RESTORE_CHUNK_SIZE = 10_000
+
+_header_length = struct.Struct("<Q")
+_offset = struct.Struct("<q")
+
+
+class _ColumnWriter:
+    def __init__(self, name: str, column) -> None:
+        self.name = name
+        self.column = column
+        self.offsets = array.array("q", [0])
+        self.nulls = bytearray()
+        self.data = tempfile.TemporaryFile()
+        self.size = 0
+
+    def append(self, row_index: int, value: typing.Any) -> None:
+        if row_index % 8 == 0:
+            self.nulls.append(0)
+        if value is None:
+            self.nulls[row_index // 8] |= 1 << (row_index % 8)
+        else:
+            encoded = self.column.cql_type.serialize(value, PROTOCOL_VERSION)
+            self.data.write(encoded)
+            self.size += len(encoded)
+        self.offsets.append(self.size)
+
+    def describe(self, position: int) -> tuple[dict, int]:
+        offsets_size = len(self.offsets) * self.offsets.itemsize
+        description = {
+            "name": self.name,
+            "db_type": self.column.db_type,
+            "offsets": position,
+            "nulls": position + offsets_size,
+            "data": position + offsets_size + len(self.nulls),
+            "size": self.size,
+        }
+        return description, description["data"] + self.size
+
+    def write_to(self, file: typing.BinaryIO) -> None:
+        offsets = self.offsets
+        if sys.byteorder != "little":
+            offsets = array.array("q", offsets)
+            offsets.byteswap()
+        file.write(offsets.tobytes())
+        file.write(self.nulls)
+        self.data.seek(0)
+        shutil.copyfileobj(self.data, file)
+        self.data.close()
+
+
+def snapshot_path(snapshot_dir: Path, model: typing.Type[cqlm.Model]) -> Path:
+    return snapshot_dir / f"{model._table_name}{FILE_SUFFIX}"
+
+
+def export_table(model: typing.Type[cqlm.Model], path: Path) -> int:
+    writers = [_ColumnWriter(name, column) for name, column in model._columns.items()]
+    rows = 0
+    for row in scan.scan(model, operation=consistency.Operation.CONFLICT_CHECK):
+        for writer in writers:
+            writer.append(rows, row.get(writer.name))
+        rows += 1
+
+    columns = []
+    position = 0
+    for writer in writers:
+        description, position = writer.describe(position)
+        columns.append(description)
+    header = json.dumps(
+        {"model": model.__name__, "rows": rows, "columns": columns}
+    ).encode()
+
+    with path.open("wb") as file:
+        file.write(MAGIC)
+        file.write(_header_length.pack(len(header)))
+        file.write(header)
+        for writer in writers:
+            writer.write_to(file)
+    return rows
+
+
+class SnapshotReader:
+    def __init__(self, path: Path) -> None:
+        self._file = path.open("rb")
+        self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._buffer[: len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a snapshot file")
+        (header_size,) = _header_length.unpack_from(self._buffer, len(MAGIC))
+        body_start = len(MAGIC) + _header_length.size
+        header = json.loads(self._buffer[body_start : body_start + header_size])
+        self._base = body_start + header_size
+        self.model_name: str = header["model"]
+        self.rows: int = header["rows"]
+        self.columns: list[dict] = header["columns"]
+
+    def column_values(
+        self,
+        column: dict,
+        cql_type: typing.Any,
+        start: int = 0,
+        stop: int | None = None,
+    ) -> typing.Iterator[typing.Any]:
+        stop = self.rows if stop is None else min(stop, self.rows)
+        offsets_start = self._base + column["offsets"]
+        nulls_start = self._base + column["nulls"]
+        data_start = self._base + column["data"]
+        for row_index in range(start, stop):
+            if self._buffer[nulls_start + row_index // 8] & (1 << (row_index % 8)):
+                yield None
+                continue
+            position = offsets_start + row_index * _offset.size
+            (value_start,) = _offset.unpack_from(self._buffer, position)
+            (value_end,) = _offset.unpack_from(self._buffer, position + _offset.size)
+            yield cql_type.deserialize(
+                self._buffer[data_start + value_start : data_start + value_end],
+                PROTOCOL_VERSION,
+            )
+
+    def close(self) -> None:
+        self._buffer.close()
+        self._file.close()
+
+    def __enter__(self) -> SnapshotReader:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _insert_cql(model: typing.Type[cqlm.Model], names: list[str]) -> str:
+    fields = ", ".join(f'"{model._columns[name].db_field_name}"' for name in names)
+    return (
+        f"INSERT INTO {model.column_family_name()} ({fields}) "
+        f"VALUES ({', '.join('?' * len(names))})"
+    )
+
+
+def import_table(
+    model: typing.Type[cqlm.Model],
+    path: Path,
+    concurrency: int = RESTORE_CONCURRENCY,
+) -> int:
+    with SnapshotReader(path) as reader:
+        if reader.model_name != model.__name__:
+            raise ValueError(f"{path} holds {reader.model_name}, not {model.__name__}")
+        columns = [
+            column for column in reader.columns if column["name"] in model._columns
+        ]
+        names = [column["name"] for column in columns]
+        session = cql_conn.get_session()
+        statement = session.prepare(_insert_cql(model, names))
+        statement.consistency_level = consistency.level(consistency.Operation.WRITE)
+        for start in range(0, reader.rows, RESTORE_CHUNK_SIZE):
+            values = zip(
+                *(
+                    reader.column_values(
+                        column,
+                        model._columns[column["name"]].cql_type,
+                        start,
+                        start + RESTORE_CHUNK_SIZE,
+                    )
+                    for column in columns
+                )
+            )
+            execute_concurrent_with_args(
+                session,
+                statement,
+                values,
+                concurrency=concurrency,
+                raise_on_first_error=True,
+            )
+        return reader.rows
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import argparse
+import json
+import typing
+import uuid
+
+from pathlib import Path
+
+import numpy as np
+
+BLOCK_SIZE = 100_000
+BASE_DATE = np.datetime64("2020-01-01")
+MAX_RESAMPLE_ROUNDS = 10
+RATING_WEIGHTS = np.array([0.05, 0.07, 0.13, 0.35, 0.40])
+
+
+class DatasetSpec(typing.NamedTuple):
+    users: int = 10_000
+    properties: int = 1_000
+    bookings: int = 50_000
+    reviews: int = 20_000
+    seed: int = 0
+    user_zipf_exponent: float = 1.1
+    hot_property_fraction: float = 0.05
+    hot_property_share: float = 0.5
+    max_nights: int = 14
+    mean_gap_days: float = 7.0
+    horizon_days: int = 365
+
+
+def _uuids(rng: np.random.Generator, count: int) -> np.ndarray:
+    raw = rng.integers(0, 256, size=(count, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    return raw
+
+
+def _uuid_strings(raw: np.ndarray) -> list[str]:
+    return [str(uuid.UUID(bytes=row)) for row in map(bytes, raw)]
+
+
+def _dates(days: np.ndarray) -> np.ndarray:
+    return np.datetime_as_string(BASE_DATE + days.astype("timedelta64[D]"), unit="D")
+
+
+def _write_lines(file: typing.TextIO, records: typing.Iterable[dict]) -> None:
+    file.writelines(json.dumps(record) + "\n" for record in records)
+
+
+def property_weights(spec: DatasetSpec, rng: np.random.Generator) -> np.ndarray:
+    hot_count = min(
+        spec.properties, int(np.ceil(spec.properties * spec.hot_property_fraction))
+    )
+    if hot_count in (0, spec.properties):
+        return np.full(spec.properties, 1 / spec.properties)
+    weights = np.full(
+        spec.properties, (1 - spec.hot_property_share) / (spec.properties - hot_count)
+    )
+    hot = rng.choice(spec.properties, size=hot_count, replace=False)
+    weights[hot] = spec.hot_property_share / hot_count
+    return weights
+
+
+class _UserSampler:
+    def __init__(self, spec: DatasetSpec, rng: np.random.Generator) -> None:
+        ranks = np.arange(1, spec.users + 1, dtype=np.float64)
+        weights = ranks**-spec.user_zipf_exponent
+        self.cdf = np.cumsum(weights / weights.sum())
+        self.permutation = rng.permutation(spec.users)
+        self.rng = rng
+
+    def sample(self, count: int) -> np.ndarray:
+        ranks = np.searchsorted(self.cdf, self.rng.random(count), side="right")
+        return self.permutation[np.minimum(ranks, len(self.cdf) - 1)]
+
+
+def _resolve_duplicate_pairs(
+    property_idx: np.ndarray, user_idx: np.ndarray, sampler: _UserSampler, users: int
+) -> np.ndarray:
+    for _ in range(MAX_RESAMPLE_ROUNDS):
+        _, first = np.unique(property_idx * users + user_idx, return_index=True)
+        duplicates = np.ones(len(user_idx), dtype=bool)
+        duplicates[first] = False
+        if not duplicates.any():
+            return duplicates
+        user_idx[duplicates] = sampler.sample(int(duplicates.sum()))
+    _, first = np.unique(property_idx * users + user_idx, return_index=True)
+    duplicates = np.ones(len(user_idx), dtype=bool)
+    duplicates[first] = False
+    return duplicates
+
+
+def _booking_days(
+    spec: DatasetSpec, rng: np.random.Generator, counts: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    total = int(counts.sum())
+    nights = rng.integers(1, spec.max_nights + 1, size=total)
+    gaps = rng.geometric(1 / (spec.mean_gap_days + 1), size=total) - 1
+    steps = nights + 1 + gaps
+    offsets = np.cumsum(steps) - steps
+    group_starts = np.repeat(np.cumsum(counts) - counts, counts)
+    offsets = offsets - offsets[group_starts]
+    property_offsets = np.repeat(
+        rng.integers(0, spec.horizon_days, size=len(counts)), counts
+    )
+    # Each property's schedule wraps around the horizon; stays that would
+    # straddle its end or run into the property's first stay are dropped.
+    start_days = (property_offsets + offsets) % spec.horizon_days
+    end_days = start_days + nights
+    fits = (offsets + nights < spec.horizon_days) & (end_days < spec.horizon_days)
+    return start_days, end_days, fits
+
+
+def generate(spec: DatasetSpec, output_dir: Path) -> dict[str, int]:
+    rng = np.random.default_rng(spec.seed)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    user_ids = _uuid_strings(_uuids(rng, spec.users))
+    property_ids = _uuid_strings(_uuids(rng, spec.properties))
+    written = {"users": spec.users, "properties": spec.properties}
+
+    with (output_dir / "users.jsonl").open("w") as file:
+        for start in range(0, spec.users, BLOCK_SIZE):
+            _write_lines(
+                file,
+                (
+                    {"id": user_ids[i], "name": f"User {i}"}
+                    for i in range(start, min(start + BLOCK_SIZE, spec.users))
+                ),
+            )
+
+    with (output_dir / "properties.jsonl").open("w") as file:
+        for start in range(0, spec.properties, BLOCK_SIZE):
+            stop = min(start + BLOCK_SIZE, spec.properties)
+            size = stop - start
+            bedrooms = rng.integers(0, 6, size=size)
+            bathrooms = rng.integers(1, 4, size=size)
+            prices = np.round(rng.lognormal(4.5, 0.5, size=size), 2)
+            _write_lines(
+                file,
+                (
+                    {
+                        "id": property_ids[start + i],
+                        "name": f"Property {start + i}",
+                        "description": f"Synthetic property {start + i}",
+                        "address": f"{start + i} Synthetic Street",
+                        "bedrooms": int(bedrooms[i]),
+                        "bathrooms": int(bathrooms[i]),
+                        "price_per_night": float(prices[i]),
+                    }
+                    for i in range(size)
+                ),
+            )
+
+    booking_counts = rng.multinomial(spec.bookings, property_weights(spec, rng))
+    review_probability = min(1.0, spec.reviews / spec.bookings) if spec.bookings else 0
+    sampler = _UserSampler(spec, rng)
+    written["bookings"] = written["reviews"] = 0
+
+    with (output_dir / "bookings.jsonl").open("w") as bookings_file, (
+        output_dir / "reviews.jsonl"
+    ).open("w") as reviews_file:
+        for start in range(0, spec.properties, BLOCK_SIZE):
+            counts = booking_counts[start : start + BLOCK_SIZE]
+            property_idx = np.repeat(np.arange(start, start + len(counts)), counts)
+            user_idx = sampler.sample(len(property_idx))
+            start_days, end_days, fits = _booking_days(spec, rng, counts)
+            keep = fits & ~_resolve_duplicate_pairs(
+                property_idx, user_idx, sampler, spec.users
+            )
+
+            property_idx, user_idx = property_idx[keep], user_idx[keep]
+            start_dates, end_dates = _dates(start_days[keep]), _dates(end_days[keep])
+            reviewed = rng.random(len(property_idx)) < review_probability
+            ratings = rng.choice(
+                np.arange(1, 6), size=len(property_idx), p=RATING_WEIGHTS
+            )
+
+            _write_lines(
+                bookings_file,
+                (
+                    {
+                        "start_date": str(start_dates[i]),
+                        "end_date": str(end_dates[i]),
+                        "user_id": user_ids[user_idx[i]],
+                        "rental_id": property_ids[property_idx[i]],
+                    }
+                    for i in range(len(property_idx))
+                ),
+            )
+            _write_lines(
+                reviews_file,
+                (
+                    {
+                        "rating": int(ratings[i]),
+                        "comment": f"Synthetic review of property {property_idx[i]}",
+                        "user_id": user_ids[user_idx[i]],
+                        "rental_id": property_ids[property_idx[i]],
+                    }
+                    for i in np.flatnonzero(reviewed)
+                ),
+            )
+            written["bookings"] += len(property_idx)
+            written["reviews"] += int(reviewed.sum())
+    return written
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic mock dataset")
+    parser.add_argument("output_dir", type=Path)
+    for field, default in DatasetSpec._field_defaults.items():
+        parser.add_argument(
+            f"--{field.replace('_', '-')}", type=type(default), default=default
+        )
+    args = parser.parse_args(argv)
+    spec = DatasetSpec(**{field: getattr(args, field) for field in DatasetSpec._fields})
+    print(generate(spec, args.output_dir))
+
+
+if __name__ == "__main__":
+    main()
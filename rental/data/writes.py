@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import collections
+import typing
+
+import cassandra.cqlengine.connection as cql_conn
+import cassandra.cqlengine.models as cqlm
+import cassandra.cqlengine.query as cql_query
+import cassandra.cqlengine.statements as cql_statements
+
+from cassandra.concurrent import execute_concurrent
+from cassandra.query import BatchStatement, BatchType, SimpleStatement
+
+from ..util import chunks
+
+DEFAULT_CONCURRENCY = 32
+GROUPING_WINDOW = 1000
+MAX_GROUP_SIZE = 50
+
+
+def collect_mutations(
+    operation: typing.Callable[[cql_query.BatchQuery], typing.Any],
+) -> list[cql_statements.BaseCQLStatement]:
+    collector = cql_query.BatchQuery()
+    operation(collector)
+    return collector.queries
+
+
+def delete_statements(
+    model: typing.Type[cqlm.Model], keys: typing.Iterable[typing.Mapping]
+) -> typing.Iterator[cql_statements.BaseCQLStatement]:
+    for key in keys:
+        yield from collect_mutations(
+            lambda batch: model.objects.batch(batch).filter(**key).delete()
+        )
+
+
+def group_by_partition(
+    statements: typing.Iterable[cql_statements.BaseCQLStatement],
+    models: typing.Iterable[typing.Type[cqlm.Model]],
+    max_group_size: int = MAX_GROUP_SIZE,
+) -> list[list[cql_statements.BaseCQLStatement]]:
+    partition_key_indexes = {
+        model.column_family_name(): model._partition_key_index for model in models
+    }
+    groups = collections.defaultdict(list)
+    for statement in statements:
+        partition_key_index = partition_key_indexes.get(statement.table)
+        if partition_key_index is None:
+            groups[(statement.table, id(statement))].append(statement)
+            continue
+        partition_key = tuple(statement.partition_key_values(partition_key_index))
+        groups[(statement.table, partition_key)].append(statement)
+    return [
+        group_chunk
+        for group in groups.values()
+        for group_chunk in chunks(group, max_group_size)
+    ]
+
+
+def _to_driver_statement(
+    group: list[cql_statements.BaseCQLStatement],
+) -> tuple[SimpleStatement | BatchStatement, dict | None]:
+    if len(group) == 1:
+        return SimpleStatement(str(group[0])), group[0].get_context()
+    batch = BatchStatement(batch_type=BatchType.UNLOGGED)
+    for statement in group:
+        batch.add(SimpleStatement(str(statement)), statement.get_context())
+    return batch, None
+
+
+def _driver_statements(
+    statements: typing.Iterable[cql_statements.BaseCQLStatement],
+    models: list[typing.Type[cqlm.Model]],
+    window: int,
+) -> typing.Iterator[tuple[SimpleStatement | BatchStatement, dict | None]]:
+    for statements_window in chunks(statements, window):
+        for group in group_by_partition(statements_window, models):
+            yield _to_driver_statement(group)
+
+
+def execute_grouped(
+    statements: typing.Iterable[cql_statements.BaseCQLStatement],
+    models: typing.Iterable[typing.Type[cqlm.Model]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    window: int = GROUPING_WINDOW,
+) -> int:
+    results = execute_concurrent(
+        cql_conn.get_session(),
+        _driver_statements(statements, list(models), window),
+        concurrency=concurrency,
+        raise_on_first_error=True,
+        results_generator=True,
+    )
+    executed = 0
+    for _ in results:
+        executed += 1
+    return executed
@@ -28,3 +28,7 @@ class ForeignKeyRestrictionViolationException(RentalException):
 
 class UniqueFieldsRestrictionViolationException(ValidationException):
     pass
+
+
+class BookingNotFoundException(RentalException):
+    pass
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import typing
+
+from cassandra import ConsistencyLevel
+from cassandra.cluster import EXEC_PROFILE_DEFAULT, Cluster, ExecutionProfile
+from cassandra.policies import (
+    ConstantSpeculativeExecutionPolicy,
+    DCAwareRoundRobinPolicy,
+    HostDistance,
+    LoadBalancingPolicy,
+    RoundRobinPolicy,
+    TokenAwarePolicy,
+)
+
+LOAD_BALANCING_POLICIES = ("token_aware", "dc_aware", "round_robin")
+COMPRESSIONS = ("lz4", "snappy")
+
+
+def _to_bool_or_compression(value: str | bool) -> str | bool:
+    if isinstance(value, bool):
+        return value
+    lowered = value.strip().lower()
+    if lowered in ("1", "true", "yes", "auto"):
+        return True
+    if lowered in ("0", "false", "no", "none", ""):
+        return False
+    if lowered not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression: {value}")
+    return lowered
+
+
+def _optional(convert: typing.Callable[[str], typing.Any]) -> typing.Callable:
+    def wrapped(value: typing.Any) -> typing.Any:
+        if value is None or value == "":
+            return None
+        return convert(value)
+
+    return wrapped
+
+
+class ExecutionProfileSpec(typing.NamedTuple):
+    load_balancing: str = "token_aware"
+    local_dc: str | None = None
+    used_hosts_per_remote_dc: int = 0
+    core_connections_per_host: int | None = None
+    max_connections_per_host: int | None = None
+    compression: str | bool = True
+    request_timeout: float = 10.0
+    speculative_delay: float | None = None
+    speculative_max_attempts: int = 2
+    protocol_version: int | None = None
+
+    @classmethod
+    def from_mapping(cls, values: typing.Mapping | None) -> ExecutionProfileSpec:
+        values = {
+            key: value
+            for key, value in (values or {}).items()
+            if value is not None and value != ""
+        }
+        unknown = set(values) - set(cls._fields)
+        if unknown:
+            raise ValueError(f"Unknown execution profile options: {sorted(unknown)}")
+        converted = {
+            key: _CONVERTERS[key](value) if isinstance(value, str) else value
+            for key, value in values.items()
+        }
+        spec = cls(**converted)
+        if spec.load_balancing not in LOAD_BALANCING_POLICIES:
+            raise ValueError(f"Unknown load balancing policy: {spec.load_balancing}")
+        return spec
+
+    def load_balancing_policy(self) -> LoadBalancingPolicy:
+        if self.load_balancing == "round_robin":
+            return RoundRobinPolicy()
+        child_policy = DCAwareRoundRobinPolicy(
+            local_dc=self.local_dc or "",
+            used_hosts_per_remote_dc=self.used_hosts_per_remote_dc,
+        )
+        if self.load_balancing == "dc_aware":
+            return child_policy
+        return TokenAwarePolicy(child_policy)
+
+    def execution_profile(
+        self, consistency: int, serial_consistency: int | None = None
+    ) -> ExecutionProfile:
+        speculative_policy = None
+        if self.speculative_delay is not None:
+            speculative_policy = ConstantSpeculativeExecutionPolicy(
+                delay=self.speculative_delay,
+                max_attempts=self.speculative_max_attempts,
+            )
+        return ExecutionProfile(
+            load_balancing_policy=self.load_balancing_policy(),
+            speculative_execution_policy=speculative_policy,
+            consistency_level=consistency,
+            serial_consistency_level=serial_consistency,
+            request_timeout=self.request_timeout,
+        )
+
+    def cluster_options(
+        self,
+        consistency: int = ConsistencyLevel.QUORUM,
+        serial_consistency: int | None = None,
+    ) -> dict[str, typing.Any]:
+        options = {
+            "execution_profiles": {
+                EXEC_PROFILE_DEFAULT: self.execution_profile(
+                    consistency, serial_consistency
+                )
+            },
+            "compression": self.compression,
+        }
+        if self.protocol_version is not None:
+            options["protocol_version"] = self.protocol_version
+        return options
+
+    def configure_pool(self, cluster: Cluster) -> None:
+        if cluster.protocol_version >= 3:
+            return
+        if self.max_connections_per_host is not None:
+            cluster.set_max_connections_per_host(
+                HostDistance.LOCAL, self.max_connections_per_host
+            )
+        if self.core_connections_per_host is not None:
+            cluster.set_core_connections_per_host(
+                HostDistance.LOCAL, self.core_connections_per_host
+            )
+
+
+_CONVERTERS: dict[str, typing.Callable[[str], typing.Any]] = {
+    "load_balancing": lambda value: value.strip().lower(),
+    "local_dc": _optional(str),
+    "used_hosts_per_remote_dc": int,
+    "core_connections_per_host": _optional(int),
+    "max_connections_per_host": _optional(int),
+    "compression": _to_bool_or_compression,
+    "request_timeout": float,
+    "speculative_delay": _optional(float),
+    "speculative_max_attempts": int,
+    "protocol_version": _optional(int),
+}
@@ -21,7 +21,14 @@ class MainFrame(ctk.CTkFrame):
         self.admin_panel = panel.DualPanel(
             self,
             title="Application Admin",
-            button_texts=["Clear Database", "Repopulate Database"],
+            button_texts=[
+                "Clear Database",
+                "Repopulate Database",
+                "Save Snapshot",
+                "Restore Snapshot",
+                "Recount Models",
+                "Rebuild Side Tables",
+            ],
             component_registry=component_registry,
         )
         self.user_panel = panel.Panel(
@@ -112,6 +119,7 @@ class MainFrame(ctk.CTkFrame):
         tiles_grid.columnconfigure(1, weight=1)
         tiles_grid.rowconfigure(0, weight=1)
         tiles_grid.rowconfigure(1, weight=1)
+        tiles_grid.rowconfigure(2, weight=1)
 
         make_reservation_tile = Tile(
             tiles_grid,
@@ -273,6 +281,44 @@ class MainFrame(ctk.CTkFrame):
         )
         u_submit_button.grid(row=2, columnspan=2, padx=10, pady=10, sticky="nsew")
 
+        availability_tile = Tile(
+            tiles_grid,
+            title="Find Available Properties",
+            component_registry=component_registry,
+        )
+        availability_tile.grid(row=2, columnspan=2, padx=10, pady=10, sticky="nsew")
+
+        a_start_date_entry = component_registry.make_entry(
+            "a_start_date_entry",
+            availability_tile.content_grid,
+            placeholder_text="Start Date",
+            font=("Roboto", 16),
+        )
+        a_start_date_entry.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
+
+        a_end_date_entry = component_registry.make_entry(
+            "a_end_date_entry",
+            availability_tile.content_grid,
+            placeholder_text="End Date",
+            font=("Roboto", 16),
+        )
+        a_end_date_entry.grid(row=0, column=1, padx=10, pady=10, sticky="nsew")
+
+        self.av_table = ScrollableTable(
+            availability_tile.content_grid,
+            headers=["Property", "Price per night", "Booked days this month"],
+            entries=[],
+        )
+        self.av_table.grid(row=1, columnspan=2, padx=10, pady=10, sticky="nsew")
+
+        a_submit_button = component_registry.make_button(
+            "a_submit_button",
+            availability_tile.content_grid,
+            text="Search",
+            font=("Roboto", 16),
+        )
+        a_submit_button.grid(row=2, columnspan=2, padx=10, pady=10, sticky="nsew")
+
     def setup_testing_panel(self, component_registry: ComponentRegistry) -> None:
         result_grid = ctk.CTkFrame(self.testing_panel.right_frame)
         result_grid.grid(padx=10, pady=10, sticky="nsew")
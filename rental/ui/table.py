@@ -1,13 +1,38 @@
+import collections
+import functools
+import typing
+
 import customtkinter as ctk
 
 from tkinter import ttk
 
+PageFetcher = typing.Callable[[typing.Any], tuple[list, typing.Any]]
+BackgroundRunner = typing.Callable[
+    [
+        typing.Callable[[], typing.Any],
+        typing.Callable[[typing.Any], None],
+        typing.Callable[[Exception], None],
+    ],
+    bool,
+]
+ErrorHandler = typing.Callable[[Exception], None]
+
+WINDOW_PAGES = 3
+PREFETCH_FRACTION = 0.2
+
 
 class ScrollableTable(ctk.CTkFrame):
     def __init__(self, parent, entries, headers):
         super().__init__(parent)
         self.entries = entries
         self.headers = headers
+        self.fetch_page: PageFetcher | None = None
+        self.run_in_background: BackgroundRunner | None = None
+        self.on_error: ErrorHandler | None = None
+        self._generation = 0
+        self._fetching = False
+        self._page_starts: list[typing.Any] = []
+        self._pages: collections.deque[tuple[int, list[str]]] = collections.deque()
 
         self.table_frame = ctk.CTkFrame(self)
         self.table_frame.pack(fill="both", expand=True)
@@ -29,19 +54,106 @@ class ScrollableTable(ctk.CTkFrame):
         self.update_entries()
 
         # Create a vertical scrollbar
-        scrollbar = ttk.Scrollbar(
+        self.scrollbar = ttk.Scrollbar(
             self.table_frame, orient="vertical", command=self.treeview.yview
         )
-        self.treeview.configure(yscrollcommand=scrollbar.set)
+        self.treeview.configure(yscrollcommand=self.on_scroll)
 
         # Pack the treeview and scrollbar
         self.treeview.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        self.scrollbar.pack(side="right", fill="y")
 
     def update_entries(self):
+        self.fetch_page = None
+        self._generation += 1
+        self._fetching = False
+        self._pages.clear()
+
         # Clear existing entries
         self.treeview.delete(*self.treeview.get_children())
 
         # Add new entries to the table
         for entry in self.entries:
             self.treeview.insert("", "end", values=entry)
+
+    def set_source(
+        self,
+        fetch_page: PageFetcher,
+        run_in_background: BackgroundRunner,
+        first_page: tuple[list, typing.Any],
+        on_error: ErrorHandler,
+    ) -> bool:
+        self.entries = []
+        self.update_entries()
+        self.fetch_page = fetch_page
+        self.run_in_background = run_in_background
+        self.on_error = on_error
+        self._page_starts = [None]
+        self._load_page(0, at_end=True, page=first_page)
+        return bool(self.treeview.get_children())
+
+    def _load_page(
+        self, page_index: int, at_end: bool, page: tuple[list, typing.Any]
+    ) -> int:
+        rows, next_state = page
+        if page_index + 1 == len(self._page_starts) and next_state is not None:
+            self._page_starts.append(next_state)
+        position = "end" if at_end else 0
+        rows = rows if at_end else reversed(rows)
+        items = [self.treeview.insert("", position, values=row) for row in rows]
+        if not at_end:
+            items.reverse()
+            self._pages.appendleft((page_index, items))
+        else:
+            self._pages.append((page_index, items))
+
+        removed = 0
+        while len(self._pages) > WINDOW_PAGES:
+            _, dropped = self._pages.popleft() if at_end else self._pages.pop()
+            self.treeview.delete(*dropped)
+            removed += len(dropped)
+        return len(items) if not at_end else -removed
+
+    def _has_next_page(self) -> bool:
+        return bool(self._pages) and self._pages[-1][0] + 1 < len(self._page_starts)
+
+    def _has_previous_page(self) -> bool:
+        return bool(self._pages) and self._pages[0][0] > 0
+
+    def _show_page(
+        self, generation: int, page_index: int, at_end: bool, page: tuple
+    ) -> None:
+        if generation != self._generation:
+            return
+        self._fetching = False
+        first = float(self.treeview.yview()[0])
+        old_total = len(self.treeview.get_children())
+        shift = self._load_page(page_index, at_end, page)
+        new_total = len(self.treeview.get_children())
+        if new_total:
+            self.treeview.yview_moveto((first * old_total + shift) / new_total)
+
+    def _fetch_failed(self, generation: int, error: Exception) -> None:
+        if generation != self._generation:
+            return
+        # The page start is kept, so the next scroll retries the same page.
+        self._fetching = False
+        self.on_error(error)
+
+    def _request_page(self, page_index: int, at_end: bool) -> None:
+        generation = self._generation
+        self._fetching = self.run_in_background(
+            functools.partial(self.fetch_page, self._page_starts[page_index]),
+            functools.partial(self._show_page, generation, page_index, at_end),
+            functools.partial(self._fetch_failed, generation),
+        )
+
+    def on_scroll(self, first: str, last: str) -> None:
+        self.scrollbar.set(first, last)
+        if self.fetch_page is None or self._fetching:
+            return
+        first, last = float(first), float(last)
+        if last >= 1 - PREFETCH_FRACTION and self._has_next_page():
+            self._request_page(self._pages[-1][0] + 1, at_end=True)
+        elif first <= PREFETCH_FRACTION and self._has_previous_page():
+            self._request_page(self._pages[0][0] - 1, at_end=False)
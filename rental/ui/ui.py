@@ -31,6 +31,15 @@ class UI:
     def add_btn_command(self, tag: str, command: Callable) -> None:
         self.component_registry.get_button(tag).configure(command=command)
 
+    def add_combo_box_search(
+        self, tag: str, search: Callable[[str], list[str]]
+    ) -> None:
+        combo_box = self.component_registry.get_combo_box(tag)
+        combo_box.bind(
+            "<KeyRelease>",
+            lambda _: combo_box.configure(values=search(combo_box.get())),
+        )
+
     def set_label_text(self, tag: str, text: str) -> None:
         self.component_registry.get_label(tag).configure(text=text)
 
@@ -1,16 +1,19 @@
+import itertools
 import subprocess
 import random
 
 from datetime import datetime, timedelta
+from typing import Iterable, Iterator
 
 
 def name_to_tag(name: str) -> str:
     return name.lower().replace(" ", "_")
 
 
-def chunks(lst: list, n: int) -> list[list]:
-    for i in range(0, len(lst), n):
-        yield lst[i : i + n]
+def chunks(iterable: Iterable, n: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, n)):
+        yield chunk
 
 
 def random_date() -> datetime:
@@ -0,0 +1,62 @@
+import queue
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Hashable
+
+DEFAULT_MAX_WORKERS = 4
+POLL_INTERVAL_MS = 50
+
+
+class UIWorker:
+    def __init__(
+        self,
+        root,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        poll_interval_ms: int = POLL_INTERVAL_MS,
+    ) -> None:
+        self.root = root
+        self.poll_interval_ms = poll_interval_ms
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ui-worker"
+        )
+        self.results: queue.Queue[tuple[Hashable, Future, Callable, Callable]] = (
+            queue.Queue()
+        )
+        self.pending: set[Hashable] = set()
+
+    def submit(
+        self,
+        key: Hashable,
+        work: Callable[[], Any],
+        on_done: Callable[[Any], None],
+        on_error: Callable[[Exception], None],
+    ) -> bool:
+        if key in self.pending:
+            return False
+        self.pending.add(key)
+        future = self.executor.submit(work)
+        future.add_done_callback(
+            lambda done: self.results.put((key, done, on_done, on_error))
+        )
+        return True
+
+    def poll(self) -> None:
+        while True:
+            try:
+                key, future, on_done, on_error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending.discard(key)
+            try:
+                result = future.result()
+            except Exception as e:
+                on_error(e)
+            else:
+                on_done(result)
+        self.root.after(self.poll_interval_ms, self.poll)
+
+    def start(self) -> None:
+        self.root.after(self.poll_interval_ms, self.poll)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,100 @@
+import datetime
+import threading
+import time
+import uuid
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from rental import bulk, exceptions
+from rental.data import claims, models
+
+
+class FakeClaimStore:
+    def __init__(self) -> None:
+        self.owners = {}
+        self.active_rentals = set()
+        self.lock = threading.Lock()
+
+    def load_shard(self, model, rows, concurrency, collect_ids):
+        rentals = {row["rental_id"] for row in rows}
+        with self.lock:
+            assert not rentals & self.active_rentals, "shards of one rental overlap"
+            self.active_rentals |= rentals
+        try:
+            for row in rows:
+                days = claims.booking_days(
+                    datetime.date.fromisoformat(row["start_date"]),
+                    datetime.date.fromisoformat(row["end_date"]),
+                )
+                keys = [(row["rental_id"], day) for day in days]
+                with self.lock:
+                    taken = any(key in self.owners for key in keys)
+                time.sleep(0.01)
+                if taken:
+                    raise exceptions.OverlappingBookingException("overlap")
+                with self.lock:
+                    self.owners.update(dict.fromkeys(keys, row))
+        finally:
+            with self.lock:
+                self.active_rentals -= rentals
+        return len(rows), []
+
+
+def _booking(rental_id, start_date, end_date):
+    return {
+        "rental_id": rental_id,
+        "user_id": uuid.uuid4(),
+        "start_date": start_date,
+        "end_date": end_date,
+    }
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = FakeClaimStore()
+    monkeypatch.setattr(bulk, "SHARD_SIZE", 2)
+    monkeypatch.setattr(bulk, "_load_shard", store.load_shard)
+    return store
+
+
+def _loader(executor):
+    return bulk._ShardedLoader(executor, 2, 1, lambda _: None)
+
+
+def test_overlapping_bookings_in_separate_shards_are_rejected(store):
+    rental_id = uuid.uuid4()
+    rows = [
+        _booking(rental_id, "2024-01-01", "2024-01-05"),
+        _booking(rental_id, "2024-02-01", "2024-02-05"),
+        *(_booking(uuid.uuid4(), "2024-01-01", "2024-01-05") for _ in range(8)),
+        _booking(rental_id, "2024-01-03", "2024-01-07"),
+        _booking(rental_id, "2024-03-01", "2024-03-05"),
+    ]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        with pytest.raises(exceptions.OverlappingBookingException):
+            _loader(executor).load(
+                models.RentalBooking, rows, partition_key="rental_id"
+            )
+
+
+def test_partitioned_shards_keep_each_rental_in_one_bucket(store):
+    rental_ids = [uuid.uuid4() for _ in range(5)]
+    rows = [
+        _booking(rental_id, f"2024-{month:02d}-01", f"2024-{month:02d}-05")
+        for month in range(1, 13)
+        for rental_id in rental_ids
+    ]
+    loader = _loader(None)
+    buckets = {}
+    for bucket, shard in loader._shards(rows, "rental_id"):
+        assert len(shard) <= bulk.SHARD_SIZE
+        for row in shard:
+            assert buckets.setdefault(row["rental_id"], bucket) == bucket
+    assert set(buckets) == set(rental_ids)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        loader = _loader(executor)
+        loader.load(models.RentalBooking, rows, partition_key="rental_id")
+    assert loader.total_rows == len(rows)
@@ -0,0 +1,33 @@
+import collections
+import datetime
+import json
+
+from rental.data import synthetic
+
+
+def _read_lines(path):
+    with path.open() as file:
+        return [json.loads(line) for line in file]
+
+
+def test_booking_dates_stay_inside_horizon(tmp_path):
+    spec = synthetic.DatasetSpec(
+        users=200, properties=20, bookings=2_000, reviews=100, horizon_days=60
+    )
+    written = synthetic.generate(spec, tmp_path)
+    bookings = _read_lines(tmp_path / "bookings.jsonl")
+    assert written["bookings"] == len(bookings) > 0
+
+    first_day = datetime.date.fromisoformat(str(synthetic.BASE_DATE))
+    last_day = first_day + datetime.timedelta(days=spec.horizon_days - 1)
+    stays = collections.defaultdict(list)
+    for booking in bookings:
+        start = datetime.date.fromisoformat(booking["start_date"])
+        end = datetime.date.fromisoformat(booking["end_date"])
+        assert first_day <= start <= end <= last_day
+        stays[booking["rental_id"]].append((start, end))
+
+    for property_stays in stays.values():
+        property_stays.sort()
+        for (_, previous_end), (start, _) in zip(property_stays, property_stays[1:]):
+            assert previous_end < start